@@ -26,59 +26,155 @@ UTILIZZO:
   python linkedin_scraper.py --input posts.xlsx --output stats_output.xlsx
 
 REQUISITI:
-  pip install playwright openpyxl pandas
+  pip install playwright openpyxl
   playwright install chromium
 """
 
 import argparse
+import asyncio
+import importlib
+import io
+import json
+import os
 import sys
-import time
 import re
 import tempfile
 from pathlib import Path
 from datetime import datetime
+from typing import BinaryIO, Union
 
-import pandas as pd
-from openpyxl import Workbook
+from openpyxl import Workbook, load_workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 from openpyxl.utils import get_column_letter
 
 try:
-    from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeout
+    from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeout
 except ImportError:
     print("ERRORE: playwright non installato.")
     print("Esegui: pip install playwright && playwright install chromium")
     sys.exit(1)
 
 
+# Numero di context paralleli nello stesso browser (una pagina ciascuno)
+MAX_PARALLEL = 4
+
+# Risorse che non servono né per il testo né per il pulsante "Esporta".
+# I fogli di stile restano: senza CSS inner_text e is_visible vedrebbero
+# anche gli elementi nascosti.
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font"})
+
+# Ogni quanti post completati il checkpoint viene scritto su disco
+CHECKPOINT_EVERY = 10
+
+# Profilo Chromium persistente (sessione LinkedIn + cache tra le esecuzioni)
+PROFILE_DIR = Path(".li_profile")
+
+# Barra di ricerca o foto profilo: presenti solo da utente autenticato
+LOGGED_IN_SELECTOR = (
+    ".search-global-typeahead, .global-nav__me-photo, "
+    "[data-test-global-nav-search], #global-nav-search"
+)
+
+
 # ─── utility ──────────────────────────────────────────────────────────────────
 
+def disable_playwright_stack_capture():
+    """
+    Playwright ispeziona lo stack Python a ogni chiamata API (goto, click, …)
+    solo per arricchire errori e tracing: è una quota rilevante della CPU.
+    Sostituiamo la cattura con una versione senza frame, salvo PW_INSPECT_STACK=1.
+    Il nome dell'API resta: etichetta gli errori ("Page.goto: …").
+    """
+    if os.getenv("PW_INSPECT_STACK", "0") != "0":
+        return
+
+    try:
+        from playwright._impl import _connection, _impl_to_api_mapping
+        internal_root = _connection._PLAYWRIGHT_MODULE_PATH
+        mapping_file = _impl_to_api_mapping.__file__
+    except (ImportError, AttributeError):
+        return
+
+    def _no_stack_trace():
+        # Si risalgono solo i frame interni di Playwright, fino al primo del
+        # chiamante: l'ultimo metodo interno incontrato è l'API invocata
+        api_name = ""
+        try:
+            frame = sys._getframe(2)
+        except ValueError:
+            frame = None
+        while frame and frame.f_code.co_filename.startswith(internal_root):
+            if frame.f_code.co_filename != mapping_file:
+                owner = frame.f_locals.get("self")
+                prefix = f"{owner.__class__.__name__}." if owner is not None else ""
+                api_name = prefix + frame.f_code.co_name
+            frame = frame.f_back
+        return {"frames": [], "apiName": api_name, "title": None}
+
+    # La funzione è importata per nome anche da altri moduli interni
+    for mod_name in ("_connection", "_sync_base", "_network", "_disposable"):
+        try:
+            mod = importlib.import_module(f"playwright._impl.{mod_name}")
+        except ImportError:
+            continue
+        if hasattr(mod, "_capture_stack_trace"):
+            mod._capture_stack_trace = _no_stack_trace
+
+
 def read_input_excel(path: str) -> list:
-    df = pd.read_excel(path, dtype=str)
-    url_col = None
-    for col in df.columns:
-        if any(kw in col.lower() for kw in ("url", "link", "post", "href")):
-            url_col = col
-            break
-    if url_col is None:
-        url_col = df.columns[0]
-    urls = df[url_col].dropna().str.strip().tolist()
+    # Serve una sola colonna: read_only scorre le righe senza caricare
+    # l'intero foglio in memoria
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = _sheet_rows(wb.worksheets[0])
+        headers = [cell_str(h) for h in next(rows, ())]
+        idx = next(
+            (i for i, h in enumerate(headers)
+             if any(kw in h.lower() for kw in ("url", "link", "post", "href"))),
+            0,
+        )
+        urls = [cell_str(r[idx]) for r in rows if len(r) > idx]
+    finally:
+        wb.close()
+    url_col = headers[idx] if headers else ""
     urls = [u for u in urls if u.startswith("http")]
     print(f"  Trovati {len(urls)} URL nella colonna '{url_col}'")
     return urls
 
 
+_URN_RE = re.compile(r"(urn:li:(?:activity|ugcPost):\d+)")
+_ACT_RE = re.compile(r"activity-(\d{10,})")
+
+
 def analytics_url(post_url: str) -> str:
     clean = post_url.strip().rstrip("/")
-    m = re.search(r"(urn:li:(?:activity|ugcPost):\d+)", clean)
+    m = _URN_RE.search(clean)
     if m:
         return f"https://www.linkedin.com/analytics/post-summary/{m.group(1)}/"
-    m = re.search(r"activity-(\d{10,})", clean)
+    m = _ACT_RE.search(clean)
     if m:
         return f"https://www.linkedin.com/analytics/post-summary/urn:li:activity:{m.group(1)}/"
     return clean
 
 
+def cell_str(val) -> str:
+    """Valore di una cella openpyxl → stringa ripulita ('' per le celle vuote)."""
+    if val is None:
+        return ""
+    if isinstance(val, float) and val.is_integer():
+        return str(int(val))
+    return str(val).strip()
+
+
+def _sheet_rows(ws):
+    """Righe (tuple di valori) di un foglio aperto in read_only."""
+    # Gli export LinkedIn dichiarano dimensioni errate (A1:A1): senza reset
+    # la modalità read_only restituirebbe solo la prima riga
+    ws.reset_dimensions()
+    return ws.iter_rows(values_only=True)
+
+
 def pct_str(val) -> str:
     """Converte 0.275 → '27.5%'"""
     try:
@@ -89,44 +185,68 @@ def pct_str(val) -> str:
 
 # ─── parsing del file Excel esportato da LinkedIn ─────────────────────────────
 
-def parse_linkedin_export(xlsx_path: str) -> dict:
+# Categorie demografiche: (campo risultato, parola chiave, solo come prefisso).
+# "azienda" è un prefisso per non confondersi con "dimensioni azienda"
+DEMO_CATEGORIES = (
+    ("demo_seniority",    "anzianit",           False),
+    ("demo_role",         "qualifica",          False),
+    ("demo_industry",     "settore",            False),
+    ("demo_company_size", "dimensioni azienda", False),
+    ("demo_location",     "localit",            False),
+    ("demo_company",      "azienda",            True),
+)
+DEMO_TOP_N = 3
+
+def parse_linkedin_export(xlsx: Union[str, BinaryIO]) -> dict:
     """
-    Legge il file xlsx esportato da LinkedIn e restituisce un dict con
-    tutti i campi estratti dai fogli RENDIMENTO e PRINCIPALI DATI DEMOGRAFICI.
+    Legge il file xlsx esportato da LinkedIn (percorso o stream binario, es.
+    io.BytesIO) e restituisce un dict con tutti i campi estratti dai fogli
+    RENDIMENTO e PRINCIPALI DATI DEMOGRAFICI.
     """
     result = {}
 
+    wb = None
     try:
-        xl = pd.ExcelFile(xlsx_path)
-        sheet_names_lower = {s.lower(): s for s in xl.sheet_names}
+        # read_only: niente stili né modello completo del workbook, un solo open
+        wb = load_workbook(xlsx, read_only=True, data_only=True)
+        sheet_names_lower = {s.lower(): s for s in wb.sheetnames}
 
         # ── Foglio RENDIMENTO ────────────────────────────────────────────────
         rendimento_key = next(
             (v for k, v in sheet_names_lower.items() if "rendimento" in k or "performance" in k),
-            xl.sheet_names[0]
+            wb.sheetnames[0]
         )
         demo_key = next(
             (v for k, v in sheet_names_lower.items() if "demograf" in k or "demographic" in k),
-            xl.sheet_names[1] if len(xl.sheet_names) > 1 else None
+            wb.sheetnames[1] if len(wb.sheetnames) > 1 else None
         )
-        # Leggi tutti i fogli necessari mentre il file è aperto, poi chiudi subito
-        df_r = pd.read_excel(xlsx_path, sheet_name=rendimento_key, header=None, dtype=str)
-        df_d = pd.read_excel(xlsx_path, sheet_name=demo_key, header=0, dtype=str) if demo_key else None
-        xl.close()  # chiude il file handle – fondamentale su Windows
 
-        # Costruiamo un dizionario label→valore dalle coppie colonna 0/colonna 1
+        # Un'unica passata sul foglio: dizionario label→valore (colonne 0/1)
+        # e, in parallelo, le righe delle sezioni "in evidenza".
+        # Il foglio ha sezioni separate per reazioni e commenti
         kv = {}
-        for _, row in df_r.iterrows():
-            label = str(row.iloc[0]).strip() if pd.notna(row.iloc[0]) else ""
-            value = str(row.iloc[1]).strip() if pd.notna(row.iloc[1]) else ""
-            if label and label != "nan":
-                kv[label.lower()] = value
+        reaz_rows = []
+        comm_rows = []
+        section = None
+        for row in _sheet_rows(wb[rendimento_key]):
+            label = cell_str(row[0]) if row else ""
+            value = cell_str(row[1]) if len(row) > 1 else ""
+            if not label:
+                continue
+            label_l = label.lower()
+            kv[label_l] = value
+            if "reazioni in evidenza" in label_l:
+                section = reaz_rows
+            elif "commenti in evidenza" in label_l:
+                section = comm_rows
+            elif section is not None:
+                section.append((label, value))
 
         def get(keys: list) -> str:
             for k in keys:
                 for kv_key, val in kv.items():
                     if k.lower() in kv_key:
-                        return val if val != "nan" else ""
+                        return val
             return ""
 
         result["post_url_export"]   = get(["url post", "post url"])
@@ -142,31 +262,9 @@ def parse_linkedin_export(xlsx_path: str) -> dict:
         result["saves"]             = get(["salvataggi", "saves"])
         result["sends"]             = get(["invii", "sends"])
 
-        # Top reazioni
-        # Il foglio ha sezioni separate per reazioni e commenti
-        # Individuiamo le righe per sezione usando l'indice
-        reaz_section = False
-        comm_section = False
-        reaz_rows = []
-        comm_rows = []
-        for _, row in df_r.iterrows():
-            label = str(row.iloc[0]).strip().lower() if pd.notna(row.iloc[0]) else ""
-            if "reazioni in evidenza" in label:
-                reaz_section = True
-                comm_section = False
-                continue
-            if "commenti in evidenza" in label:
-                comm_section = True
-                reaz_section = False
-                continue
-            if reaz_section and label:
-                reaz_rows.append((str(row.iloc[0]).strip(), str(row.iloc[1]).strip() if pd.notna(row.iloc[1]) else ""))
-            if comm_section and label:
-                comm_rows.append((str(row.iloc[0]).strip(), str(row.iloc[1]).strip() if pd.notna(row.iloc[1]) else ""))
-
         def section_val(rows, keyword):
             for label, val in rows:
-                if keyword.lower() in label.lower() and val and val != "nan":
+                if keyword.lower() in label.lower() and val:
                     return val
             return ""
 
@@ -178,60 +276,90 @@ def parse_linkedin_export(xlsx_path: str) -> dict:
         result["comments_top_industry"]  = section_val(comm_rows, "settore")
 
         # ── Foglio PRINCIPALI DATI DEMOGRAFICI ──────────────────────────────
-        if df_d is not None:
-            # Colonne: Categoria | Valore | %
-            col_cat = df_d.columns[0]
-            col_val = df_d.columns[1]
-            col_pct = df_d.columns[2]
-
-            def top_demo(category_kw: str, n: int = 3) -> str:
-                mask = df_d[col_cat].str.lower().str.contains(category_kw, na=False)
-                sub = df_d[mask].head(n)
-                parts = []
-                for _, row in sub.iterrows():
-                    val = str(row[col_val]).strip()
-                    pct = pct_str(row[col_pct])
-                    if val and val != "nan":
-                        parts.append(f"{val} ({pct})")
-                return " | ".join(parts)
-
-            result["demo_seniority"]    = top_demo("anzianit")
-            result["demo_role"]         = top_demo("qualifica")
-            result["demo_industry"]     = top_demo("settore")
-            result["demo_company_size"] = top_demo("dimensioni azienda")
-            result["demo_location"]     = top_demo("localit")
-            result["demo_company"]      = top_demo("^azienda")
+        if demo_key:
+            # Colonne: Categoria | Valore | %  (la prima riga è l'intestazione).
+            # Una sola passata distribuisce le righe nelle categorie: per
+            # ognuna si tengono le prime DEMO_TOP_N, poi si scartano quelle
+            # senza valore
+            buckets = {field: [] for field, _, _ in DEMO_CATEGORIES}
+            rows = _sheet_rows(wb[demo_key])
+            next(rows, None)
+            for r in rows:
+                if not r:
+                    continue
+                cat = cell_str(r[0]).lower()
+                if not cat:
+                    continue
+                for field, kw, prefix in DEMO_CATEGORIES:
+                    bucket = buckets[field]
+                    if len(bucket) < DEMO_TOP_N and (cat.startswith(kw) if prefix else kw in cat):
+                        bucket.append((cell_str(r[1]) if len(r) > 1 else "", r[2] if len(r) > 2 else None))
+
+            for field, bucket in buckets.items():
+                result[field] = " | ".join(f"{val} ({pct_str(pct)})" for val, pct in bucket if val)
 
     except Exception as exc:
         result["parse_error"] = str(exc)[:200]
         print(f"    ✗ Errore parsing export: {exc}")
+    finally:
+        if wb is not None:
+            wb.close()  # chiude il file handle – fondamentale su Windows
 
     return result
 
 
 # ─── estrazione testo post dalla pagina ───────────────────────────────────────
 
+# Pattern statici, compilati una volta sola all'import
+SCOPERTA_SPLIT_RE = re.compile(r"\nScoperta\n")
+ANALYTICS_HEADER_RE = re.compile(r".+ha pubblicato questo post\s*[•·]\s*\S+\n?")
+AUTHOR_HEADER_RE = re.compile(
+    r"ha pubblicato questo post\s*[•·][^\n]*\n"   # header autore
+    r"(?:[^\n]*\n){0,3}"                           # eventuali righe accessorie
+)
+SEE_MORE_RE = re.compile(r"[…\.]{3}visualizza altro\s*")
+SEE_MORE_TAIL_RE = re.compile(r"[…\.]{3}visualizza altro\s*$")
+
+# Indicatori di fine post (inizio commenti / reazioni), in un'unica
+# alternanza: una sola scansione, vince il match più a sinistra
+END_MARKERS_RE = re.compile(
+    "|".join(f"(?:{m})" for m in (
+        r"\nReazioni\n",
+        r"\nCommenti\n",
+        r"\nAggiungi un commento",
+        r"\nRispondi",
+        r"\nMi piace\s*\n",
+        r"\nCondividi\n",
+        r"\nInvia\n",
+        r"\nPost correlati",
+        r"\nPotrebbe interessarti",
+        r"\nAltri post di",
+        r"\n\d+ reazioni?\n",
+        r"\n\d+ commenti?\n",
+    )),
+    re.IGNORECASE,
+)
+
+
 def extract_post_text(page_text: str) -> str:
     """
     Estrae il testo del post dalla pagina analytics (prima di 'Scoperta').
     Usata come fallback se la visita al post originale fallisce.
     """
-    parts = re.split(r"\nScoperta\n", page_text, maxsplit=1)
+    parts = SCOPERTA_SPLIT_RE.split(page_text, maxsplit=1)
     if len(parts) < 2:
         return ""
     block = parts[0]
-    m = re.search(r".+ha pubblicato questo post\s*[•·]\s*\S+\n?", block)
+    m = ANALYTICS_HEADER_RE.search(block)
     if m:
         block = block[m.end():]
     else:
         lines = block.split("\n")
         start = next((i for i, l in enumerate(lines) if len(l.strip()) > 30 and i > 5), 0)
         block = "\n".join(lines[start:])
-    block = re.sub(r"\nhashtag\n", " ", block)
-    block = re.sub(r"[…\.]{3}visualizza altro\s*$", "", block)
-    half = len(block) // 2
-    if block[:50].strip() and block[half:half+50].strip().startswith(block[:30].strip()):
-        block = block[:half]
+    block = block.replace("\nhashtag\n", " ")
+    if "visualizza altro" in block:
+        block = SEE_MORE_TAIL_RE.sub("", block)
     return block.strip()
 
 
@@ -245,11 +373,7 @@ def extract_post_text_from_post_page(page_text: str) -> str:
     # Rimuovi rumore di navigazione iniziale (barra nav, notifiche, ecc.)
     # Cerca l'inizio del post: di solito dopo "• Xh" o "• Xm" (tempo relativo)
     # oppure dopo una data tipo "17 nov"
-    m = re.search(
-        r"ha pubblicato questo post\s*[•·][^\n]*\n"   # header autore
-        r"(?:[^\n]*\n){0,3}",                           # eventuali righe accessorie
-        page_text
-    )
+    m = AUTHOR_HEADER_RE.search(page_text)
     if m:
         block = page_text[m.end():]
     else:
@@ -259,31 +383,19 @@ def extract_post_text_from_post_page(page_text: str) -> str:
         block = "\n".join(lines[start:])
 
     # Il testo del post finisce quando cominciano i commenti / reazioni
-    # Indicatori di fine post:
-    end_markers = [
-        r"\nReazioni\n",
-        r"\nCommenti\n",
-        r"\nAggiungi un commento",
-        r"\nRispondi",
-        r"\nMi piace\s*\n",
-        r"\nCondividi\n",
-        r"\nInvia\n",
-        r"\nPost correlati",
-        r"\nPotrebbe interessarti",
-        r"\nAltri post di",
-        r"\n\d+ reazioni?\n",
-        r"\n\d+ commenti?\n",
-    ]
-    earliest = len(block)
-    for marker in end_markers:
-        m2 = re.search(marker, block, re.IGNORECASE)
-        if m2 and m2.start() < earliest:
-            earliest = m2.start()
-    block = block[:earliest]
-
-    # Pulizia
-    block = re.sub(r"\nhashtag\n", " ", block)
-    block = re.sub(r"[…\.]{3}visualizza altro\s*", "", block)
+    m2 = END_MARKERS_RE.search(block)
+    if m2:
+        block = block[:m2.start()]
+
+    return clean_post_block(block)
+
+
+def clean_post_block(block: str) -> str:
+    """Pulizia finale del testo del post ('' se troppo corto per essere valido)."""
+    # Sostituzioni letterali: il regex parte solo se il marcatore è presente
+    block = block.replace("\nhashtag\n", " ")
+    if "visualizza altro" in block:
+        block = SEE_MORE_RE.sub("", block)
     block = block.strip()
 
     # Sanity check: se troppo corto, probabilmente qualcosa è andato storto
@@ -295,7 +407,40 @@ def extract_post_text_from_post_page(page_text: str) -> str:
 
 # ─── scraping principale ──────────────────────────────────────────────────────
 
-def scrape_post(page, post_url: str, download_dir: Path) -> dict:
+# Il contenuto del post è nel DOM (sostituisce le pause fisse dopo goto)
+POST_READY_SELECTOR = "article, .feed-shared-update-v2, [data-urn]"
+
+# Contenitore del solo testo del post
+POST_BODY_SELECTOR = "div.feed-shared-update-v2__description, .update-components-text"
+
+# Vero quando nessun toggle "visualizza altro" / "see more" è ancora visibile
+SEE_MORE_EXPANDED_JS = """() => ![...document.querySelectorAll(
+    'button.feed-shared-inline-show-more-text__see-more-less-toggle'
+)].some(b => b.offsetParent && /visualizza altro|see more/i.test(b.innerText))"""
+
+# Toggle "visualizza altro" / "see more": un unico selettore, una sola query
+SEE_MORE_SELECTOR = (
+    "button.feed-shared-inline-show-more-text__see-more-less-toggle, "
+    "button:has-text('visualizza altro'), "
+    "button:has-text('see more'), "
+    "[aria-label*='visualizza altro']"
+)
+
+# Pulsante "Esporta" della pagina analytics (IT / EN)
+EXPORT_SELECTOR = (
+    "button:has-text('Esporta'), button:has-text('Export'), "
+    "[aria-label*='Esporta'], [aria-label*='Export']"
+)
+# Ultima risorsa, provata solo se nessun pulsante compare: in un'unione
+# l'ordine è quello del DOM, e un testo qualsiasi vincerebbe sul pulsante
+EXPORT_TEXT_SELECTOR = ":text('Esporta'), :text('Export')"
+
+
+def _is_login_redirect(url: str) -> bool:
+    return any(x in url for x in ("authwall", "/login", "checkpoint", "uas/authenticate"))
+
+
+async def scrape_post(page, post_url: str) -> dict:
     result = {
         "post_url":              post_url,
         "post_text":             "",
@@ -330,122 +475,96 @@ def scrape_post(page, post_url: str, download_dir: Path) -> dict:
         a_url = analytics_url(post_url)
         print(f"    → {a_url}")
 
-        # ── 1. Naviga alla pagina analytics ───────────────────────────────
-        page.goto(a_url, wait_until="domcontentloaded", timeout=30000)
-
-        try:
-            page.wait_for_selector(
-                "button:has-text('Esporta'), button:has-text('Export'), "
-                "[aria-label*='Esporta'], [aria-label*='Export']",
-                timeout=15000
-            )
-        except PlaywrightTimeout:
-            pass
-
-        time.sleep(4)
-
-        # Controllo redirect login
-        if any(x in page.url for x in ("authwall", "/login", "checkpoint", "uas/authenticate")):
-            result["error"] = "Redirect al login – sessione scaduta"
-            print("    ✗ Redirect login")
-            return result
-
-        # ── 2. Visita il post originale e leggi il testo COMPLETO ──────────
+        # ── 1. Visita il post originale e leggi il testo COMPLETO ──────────
         #    La pagina analytics tronca il testo con "visualizza altro".
-        #    Visitiamo quindi direttamente l'URL del post, clicchiamo
-        #    "visualizza altro" per espandere, e solo dopo torniamo all'analytics.
+        #    Si parte quindi dall'URL del post, si clicca "visualizza altro"
+        #    per espandere, e solo dopo si apre (una volta) l'analytics.
         try:
-            page.goto(post_url, wait_until="domcontentloaded", timeout=20000)
-            time.sleep(3)
+            await page.goto(post_url, wait_until="domcontentloaded", timeout=20000)
+            if _is_login_redirect(page.url):
+                result["error"] = "Redirect al login – sessione scaduta"
+                print("    ✗ Redirect login")
+                return result
+            try:
+                await page.wait_for_selector(POST_READY_SELECTOR, timeout=10000)
+            except PlaywrightTimeout:
+                pass
 
             # Clicca tutti i pulsanti "visualizza altro" / "see more" presenti
-            for see_more_sel in [
-                "button.feed-shared-inline-show-more-text__see-more-less-toggle",
-                "button:has-text('visualizza altro')",
-                "button:has-text('…visualizza altro')",
-                "button:has-text('see more')",
-                "[aria-label*='visualizza altro']",
-            ]:
+            # (ogni elemento compare una volta sola anche se combacia con più
+            # alternative del selettore, quindi non viene richiuso)
+            clicked = False
+            try:
+                for btn in await page.query_selector_all(SEE_MORE_SELECTOR):
+                    if await btn.is_visible():
+                        await btn.click()
+                        clicked = True
+            except Exception:
+                pass
+
+            # Un'unica attesa: finché resta un toggle "visualizza altro" visibile
+            if clicked:
                 try:
-                    btns = page.query_selector_all(see_more_sel)
-                    for btn in btns:
-                        if btn.is_visible():
-                            btn.click()
-                            time.sleep(0.5)
-                except Exception:
+                    await page.wait_for_function(SEE_MORE_EXPANDED_JS, timeout=2000)
+                except PlaywrightTimeout:
                     pass
 
-            time.sleep(1)
-            post_page_text = page.inner_text("body")
-            result["post_text"] = extract_post_text_from_post_page(post_page_text)
+            # Solo il sottoalbero della descrizione (pochi KB invece dell'intero
+            # body); il body completo resta come fallback
+            body_loc = page.locator(POST_BODY_SELECTOR).first
+            if await body_loc.count():
+                result["post_text"] = clean_post_block(await body_loc.inner_text(timeout=5000))
+            if not result["post_text"]:
+                post_page_text = await page.inner_text("body")
+                result["post_text"] = extract_post_text_from_post_page(post_page_text)
         except Exception as e_txt:
             print(f"    ⚠ Impossibile leggere testo dal post originale: {e_txt}")
             result["post_text"] = ""
 
-        # ── 3. Torna alla pagina analytics, clicca "Esporta" ─────────────
-        page.goto(a_url, wait_until="domcontentloaded", timeout=30000)
+        # ── 2. Naviga (una sola volta) alla pagina analytics ─────────────
+        await page.goto(a_url, wait_until="domcontentloaded", timeout=30000)
+        if _is_login_redirect(page.url):
+            result["error"] = "Redirect al login – sessione scaduta"
+            print("    ✗ Redirect login")
+            return result
+
+        # ── 3. Clicca "Esporta" e intercetta il download ──────────────────
+        # Un solo locator: l'attesa e la ricerca del pulsante coincidono
+        export_btn = page.locator(f"{EXPORT_SELECTOR} >> visible=true").first
         try:
-            page.wait_for_selector(
-                "button:has-text('Esporta'), button:has-text('Export'), "
-                "[aria-label*='Esporta'], [aria-label*='Export']",
-                timeout=15000
-            )
+            await export_btn.wait_for(state="visible", timeout=15000)
         except PlaywrightTimeout:
-            pass
-        time.sleep(3)
-
-        page_text = page.inner_text("body")  # usato nel fallback stats
-
-        # ── 4. Clicca "Esporta" e intercetta il download ──────────────────
-        export_btn = None
-        for selector in [
-            "button:has-text('Esporta')",
-            "button:has-text('Export')",
-            "[aria-label*='Esporta']",
-            "[aria-label*='Export']",
-            "text=Esporta",
-            "text=Export",
-        ]:
-            try:
-                btn = page.query_selector(selector)
-                if btn and btn.is_visible():
-                    export_btn = btn
-                    break
-            except Exception:
-                pass
+            fallback = page.locator(f"{EXPORT_TEXT_SELECTOR} >> visible=true").first
+            export_btn = fallback if await fallback.count() else None
 
         if not export_btn:
             result["error"] = "Pulsante Esporta non trovato"
             print("    ✗ Pulsante Esporta non trovato")
             # Fallback: prova a estrarre le stats dal testo della pagina
+            page_text = await page.inner_text("body")
             _fill_stats_from_text(result, page_text)
             return result
 
         # Intercetta il download
-        with page.expect_download(timeout=30000) as download_info:
-            export_btn.click()
+        async with page.expect_download(timeout=30000) as download_info:
+            await export_btn.click()
 
-        download = download_info.value
+        download = await download_info.value
 
-        # Salva il file nella cartella temporanea
-        file_name = download.suggested_filename or f"export_{int(time.time())}.xlsx"
-        save_path = download_dir / file_name
-        download.save_as(str(save_path))
+        # Il browser ha già scritto il file nella cartella dei download:
+        # lo leggiamo in memoria una volta sola, senza copiarlo con save_as
+        file_name = download.suggested_filename or "export.xlsx"
+        export_bytes = (await download.path()).read_bytes()
+        await download.delete()
         print(f"    ↓ Download: {file_name}")
 
-        # ── 5. Parsa il file scaricato ─────────────────────────────────────
-        export_data = parse_linkedin_export(str(save_path))
+        # ── 4. Parsa il file scaricato ─────────────────────────────────────
+        export_data = parse_linkedin_export(io.BytesIO(export_bytes))
         result.update(export_data)
 
         # L'URL nel file export può differire (ugcPost vs activity); teniamo l'originale
         result["post_url"] = post_url
 
-        # Pulizia file temporaneo
-        try:
-            save_path.unlink()
-        except Exception:
-            pass
-
         print(
             f"    ✓  impr={result['impressions'] or '—':>6}  "
             f"reach={result['unique_views'] or '—':>6}  "
@@ -464,16 +583,38 @@ def scrape_post(page, post_url: str, download_dir: Path) -> dict:
     return result
 
 
+THOUSANDS_RE = re.compile(r"[.,](?=\d{3}(?!\d))")
+SEPARATORS_TABLE = str.maketrans("", "", ".,")
+LABEL_RES = {
+    label: re.compile(rf"^{re.escape(label)}\n+([\d\.,]+)", re.MULTILINE)
+    for label in ("Reazioni", "Commenti", "Diffusioni post", "Salvataggi", "Invii su LinkedIn")
+}
+SCOPERTA_STAT_RE = re.compile(r"Scoperta\n+([\d\.,]+)")
+IMPRESSIONI_STAT_RE = re.compile(r"Impressioni\n+([\d\.,]+)")
+
+
+def strip_thousands(num: str) -> str:
+    """'1.234' → '1234'. Il regex serve solo se c'è un separatore (es. '1,5' resta invariato)."""
+    if "." not in num and "," not in num:
+        return num
+    return THOUSANDS_RE.sub("", num)
+
+
+def to_int(value) -> int:
+    """Converte '1.234' / '1,234' / 1234 in int (ValueError se non numerico)."""
+    return int(str(value).translate(SEPARATORS_TABLE))
+
+
 def _fill_stats_from_text(result: dict, text: str):
     """Fallback: estrae statistiche dal testo della pagina se il download fallisce."""
     def after(label):
-        m = re.search(rf"^{re.escape(label)}\n+([\d\.,]+)", text, re.MULTILINE)
-        return re.sub(r"[.,](?=\d{{3}}(?!\d))", "", m.group(1)) if m else ""
+        m = LABEL_RES[label].search(text)
+        return strip_thousands(m.group(1)) if m else ""
 
-    m = re.search(r"Scoperta\n+([\d\.,]+)", text)
-    if m: result["impressions"] = re.sub(r"[.,](?=\d{3}(?!\d))", "", m.group(1))
-    m = re.search(r"Impressioni\n+([\d\.,]+)", text)
-    if m: result["unique_views"] = re.sub(r"[.,](?=\d{3}(?!\d))", "", m.group(1))
+    m = SCOPERTA_STAT_RE.search(text)
+    if m: result["impressions"] = strip_thousands(m.group(1))
+    m = IMPRESSIONI_STAT_RE.search(text)
+    if m: result["unique_views"] = strip_thousands(m.group(1))
     result["reactions"] = after("Reazioni")
     result["comments"]  = after("Commenti")
     result["reposts"]   = after("Diffusioni post")
@@ -531,94 +672,123 @@ FIELD_MAP = [
     "post_url", "scraped_at", "error",
 ]
 
+# Nome colonna per posizione, allineato a FIELD_MAP (calcolato una volta)
+COLUMN_NAMES = tuple(col_name for col_name, _ in COLUMNS)
+
 NUMERIC_COLS = {
     "Impressioni", "Utenti Raggiunti", "Reazioni", "Commenti",
     "Diffusioni", "Salvataggi", "Invii LinkedIn",
     "Visite Profilo", "Follower Acquisiti",
 }
 
+# Stili condivisi: gli oggetti openpyxl sono immutabili/hashable, quindi se ne
+# crea uno per classe di stile e lo si riusa per tutte le celle
+HDR_FONT   = Font(bold=True, color="FFFFFF", name="Arial", size=10)
+HDR_ALIGN  = Alignment(horizontal="center", vertical="center", wrap_text=True)
+THIN_SIDE  = Side(style="thin", color="CCCCCC")
+BORDER     = Border(left=THIN_SIDE, right=THIN_SIDE, bottom=THIN_SIDE, top=THIN_SIDE)
+
+# Raggruppa le colonne per sezione con colori header diversi
+SECTION_COLORS = {
+    "Testo del Post": "0A66C2",        "Data Pubblicazione": "0A66C2", "Ora": "0A66C2",
+    "Impressioni": "1B6CA8",           "Utenti Raggiunti": "1B6CA8",
+    "Reazioni": "1B6CA8",              "Commenti": "1B6CA8",
+    "Diffusioni": "1B6CA8",            "Salvataggi": "1B6CA8",
+    "Invii LinkedIn": "1B6CA8",        "Visite Profilo": "1B6CA8",
+    "Follower Acquisiti": "1B6CA8",
+    "React. – Qualifica": "2E7D32",    "React. – Città": "2E7D32",    "React. – Settore": "2E7D32",
+    "Comm. – Qualifica": "1B5E20",     "Comm. – Città": "1B5E20",     "Comm. – Settore": "1B5E20",
+    "Demo: Anzianità": "6A1B9A",       "Demo: Qualifiche": "6A1B9A",  "Demo: Settori": "6A1B9A",
+    "Demo: Dim. Azienda": "6A1B9A",    "Demo: Città": "6A1B9A",       "Demo: Aziende": "6A1B9A",
+    "Post URL": "37474F",              "Estratto Il": "37474F",        "Errore": "C62828",
+}
+DEFAULT_HDR_COLOR = "0A66C2"
+SECTION_FILLS = {
+    color: PatternFill("solid", start_color=color)
+    for color in set(SECTION_COLORS.values()) | {DEFAULT_HDR_COLOR}
+}
+
+FILL_EVEN     = PatternFill("solid", start_color="EBF3FB")
+FILL_ODD      = PatternFill("solid", start_color="FFFFFF")
+DATA_FONT     = Font(name="Arial", size=10)
+URL_FONT      = Font(name="Arial", size=10, color="0A66C2", underline="single")
+WRAP_ALIGN    = Alignment(wrap_text=True, vertical="top")
+CENTER_ALIGN  = Alignment(horizontal="center", vertical="top")
+URL_ALIGN     = Alignment(vertical="top")
+DEFAULT_ALIGN = Alignment(vertical="top", wrap_text=True)
+
+
 
 def save_to_excel(records: list, output_path: str):
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "LinkedIn Stats"
-
-    hdr_fill  = PatternFill("solid", start_color="0A66C2")
-    hdr_font  = Font(bold=True, color="FFFFFF", name="Arial", size=10)
-    hdr_align = Alignment(horizontal="center", vertical="center", wrap_text=True)
-    thin      = Side(style="thin", color="CCCCCC")
-    border    = Border(left=thin, right=thin, bottom=thin, top=thin)
-
-    # Raggruppa le colonne per sezione con colori header diversi
-    section_colors = {
-        "Testo del Post": "0A66C2",        "Data Pubblicazione": "0A66C2", "Ora": "0A66C2",
-        "Impressioni": "1B6CA8",           "Utenti Raggiunti": "1B6CA8",
-        "Reazioni": "1B6CA8",              "Commenti": "1B6CA8",
-        "Diffusioni": "1B6CA8",            "Salvataggi": "1B6CA8",
-        "Invii LinkedIn": "1B6CA8",        "Visite Profilo": "1B6CA8",
-        "Follower Acquisiti": "1B6CA8",
-        "React. – Qualifica": "2E7D32",    "React. – Città": "2E7D32",    "React. – Settore": "2E7D32",
-        "Comm. – Qualifica": "1B5E20",     "Comm. – Città": "1B5E20",     "Comm. – Settore": "1B5E20",
-        "Demo: Anzianità": "6A1B9A",       "Demo: Qualifiche": "6A1B9A",  "Demo: Settori": "6A1B9A",
-        "Demo: Dim. Azienda": "6A1B9A",    "Demo: Città": "6A1B9A",       "Demo: Aziende": "6A1B9A",
-        "Post URL": "37474F",              "Estratto Il": "37474F",        "Errore": "C62828",
-    }
+    # write_only: le righe vengono serializzate man mano invece di tenere
+    # in memoria un oggetto Cell (con i suoi stili) per ogni valore
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("LinkedIn Stats")
 
+    # In write_only larghezze, altezze e riquadri bloccati vanno impostati
+    # prima di scrivere le righe
     for ci, (col_name, col_w) in enumerate(COLUMNS, start=1):
-        c = ws.cell(row=1, column=ci, value=col_name)
-        color = section_colors.get(col_name, "0A66C2")
-        c.font = hdr_font
-        c.fill = PatternFill("solid", start_color=color)
-        c.alignment = hdr_align
-        c.border = border
         ws.column_dimensions[get_column_letter(ci)].width = col_w
-
-    ws.row_dimensions[1].height = 36
     ws.freeze_panes = "A2"
+    ws.row_dimensions[1].height = 36
 
-    fill_even  = PatternFill("solid", start_color="EBF3FB")
-    fill_odd   = PatternFill("solid", start_color="FFFFFF")
-    data_font  = Font(name="Arial", size=10)
-    wrap_al    = Alignment(wrap_text=True, vertical="top")
-    center_al  = Alignment(horizontal="center", vertical="top")
-    url_font   = Font(name="Arial", size=10, color="0A66C2", underline="single")
+    header = []
+    for col_name in COLUMN_NAMES:
+        c = WriteOnlyCell(ws, value=col_name)
+        c.font = HDR_FONT
+        c.fill = SECTION_FILLS[SECTION_COLORS.get(col_name, DEFAULT_HDR_COLOR)]
+        c.alignment = HDR_ALIGN
+        c.border = BORDER
+        header.append(c)
+    ws.append(header)
 
     for ri, record in enumerate(records, start=2):
-        fill = fill_even if ri % 2 == 0 else fill_odd
-        for ci, (field, (col_name, _)) in enumerate(zip(FIELD_MAP, COLUMNS), start=1):
-            value = record.get(field, "")
-            c = ws.cell(row=ri, column=ci, value=value)
+        fill = FILL_EVEN if ri % 2 == 0 else FILL_ODD
+        row = []
+        values = [record.get(field, "") for field in FIELD_MAP]
+        for col_name, value in zip(COLUMN_NAMES, values):
+            c = WriteOnlyCell(ws, value=value)
             c.fill = fill
-            c.border = border
+            c.border = BORDER
 
             if col_name == "Testo del Post":
-                c.font = data_font
-                c.alignment = wrap_al
+                c.font = DATA_FONT
+                c.alignment = WRAP_ALIGN
             elif col_name == "Post URL":
-                c.font = url_font
-                c.alignment = Alignment(vertical="top")
+                c.font = URL_FONT
+                c.alignment = URL_ALIGN
                 if value:
                     try:
                         c.hyperlink = value
                     except Exception:
                         pass
             elif col_name in NUMERIC_COLS:
-                c.font = data_font
-                c.alignment = center_al
+                c.font = DATA_FONT
+                c.alignment = CENTER_ALIGN
                 try:
-                    c.value = int(str(value).replace(".", "").replace(",", "")) if value else ""
+                    c.value = to_int(value) if value else ""
                 except (ValueError, TypeError):
                     c.value = value
             else:
-                c.font = data_font
-                c.alignment = Alignment(vertical="top", wrap_text=True)
+                c.font = DATA_FONT
+                c.alignment = DEFAULT_ALIGN
+            row.append(c)
 
         ws.row_dimensions[ri].height = 90
+        ws.append(row)
 
     # ── Foglio Riepilogo ──────────────────────────────────────────────────
     ws2 = wb.create_sheet("Riepilogo")
-    ws2["A1"] = "LinkedIn Post Analytics – Riepilogo"
-    ws2["A1"].font = Font(bold=True, size=14, name="Arial", color="0A66C2")
+    ws2.column_dimensions["A"].width = 34
+    ws2.column_dimensions["B"].width = 60
+
+    def cell(value, font):
+        c = WriteOnlyCell(ws2, value=value)
+        c.font = font
+        return c
+
+    ws2.append([cell("LinkedIn Post Analytics – Riepilogo", Font(bold=True, size=14, name="Arial", color="0A66C2"))])
+    ws2.append([])
 
     ok    = [r for r in records if not r.get("error")]
     errs  = [r for r in records if r.get("error")]
@@ -631,23 +801,160 @@ def save_to_excel(records: list, output_path: str):
         ("Post con testo estratto",     len(with_text)),
         ("Data estrazione",             datetime.now().strftime("%Y-%m-%d %H:%M")),
     ]
-    for i, (label, val) in enumerate(stats_rows, start=3):
-        ws2.cell(row=i, column=1, value=label).font = Font(bold=True, name="Arial")
-        ws2.cell(row=i, column=2, value=val).font = Font(name="Arial")
+    for label, val in stats_rows:
+        ws2.append([cell(label, Font(bold=True, name="Arial")), cell(val, Font(name="Arial"))])
 
     if errs:
-        ws2.cell(row=9, column=1, value="Post con errori:").font = Font(bold=True, name="Arial", color="C62828")
-        for j, r in enumerate(errs, start=10):
-            ws2.cell(row=j, column=1, value=r["post_url"][:80]).font = Font(name="Arial", size=9)
-            ws2.cell(row=j, column=2, value=r["error"]).font = Font(name="Arial", size=9, color="C62828")
-
-    ws2.column_dimensions["A"].width = 34
-    ws2.column_dimensions["B"].width = 60
+        ws2.append([])
+        ws2.append([cell("Post con errori:", Font(bold=True, name="Arial", color="C62828"))])
+        for r in errs:
+            ws2.append([
+                cell(r["post_url"][:80], Font(name="Arial", size=9)),
+                cell(r["error"], Font(name="Arial", size=9, color="C62828")),
+            ])
 
     wb.save(output_path)
     print(f"\n  ✅  {len(records)} record salvati → {output_path}")
 
 
+def checkpoint_path(output_path: str) -> Path:
+    """File JSON Lines in cui i record completati vengono accodati man mano."""
+    # Sempre un nome distinto dall'output, qualunque sia la sua estensione
+    out = Path(output_path)
+    return out.with_name(out.stem + "_checkpoint.jsonl")
+
+
+async def _block_heavy_resources(route):
+    """Interrompe immagini, video e font: riducono banda e tempi di caricamento."""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+LAUNCH_ARGS = [
+    "--start-maximized",
+    "--disable-blink-features=AutomationControlled",
+    "--blink-settings=imagesEnabled=false",
+]
+CONTEXT_OPTIONS = {
+    "viewport": {"width": 1400, "height": 900},
+    "accept_downloads": True,
+    "user_agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/120.0.0.0 Safari/537.36"
+    ),
+}
+
+
+async def login_state(p, download_dir: Path, headless: bool) -> dict:
+    """
+    Verifica il login sul profilo persistente (login manuale se serve)
+    e restituisce lo storage_state da condividere con i context di lavoro.
+    """
+    # Profilo persistente: cookie, localStorage e cache HTTP restano su
+    # disco tra un'esecuzione e l'altra, quindi il login si fa una volta
+    context = await p.chromium.launch_persistent_context(
+        user_data_dir=str(PROFILE_DIR),
+        headless=headless,
+        args=LAUNCH_ARGS,
+        downloads_path=str(download_dir),
+        **CONTEXT_OPTIONS,
+    )
+    try:
+        await context.route("**/*", _block_heavy_resources)
+        page = context.pages[0] if context.pages else await context.new_page()
+
+        logged_in = False
+        await page.goto("https://www.linkedin.com/feed/", wait_until="domcontentloaded")
+        try:
+            await page.wait_for_selector(LOGGED_IN_SELECTOR, timeout=5000)
+            logged_in = True
+            print("   ✅  Sessione del profilo valida – avvio scraping …\n")
+        except PlaywrightTimeout:
+            pass
+
+        if not logged_in:
+            print("\n🔐 Apro LinkedIn … Effettua il login nel browser.")
+            print("   (Attendo fino a 3 minuti)\n")
+            await page.goto("https://www.linkedin.com/login", wait_until="domcontentloaded")
+
+            try:
+                # Aspetta la barra di ricerca o la foto profilo (senza eval/unsafe-eval)
+                await page.wait_for_selector(LOGGED_IN_SELECTOR, timeout=180000)
+                print("   ✅  Login rilevato – avvio scraping …\n")
+            except PlaywrightTimeout:
+                print("   ⚠️  Timeout login, procedo comunque …\n")
+
+        return await context.storage_state()
+    finally:
+        await context.close()
+
+
+async def scrape_all(urls: list, download_dir: Path, args) -> list:
+    """
+    Verifica il login (profilo persistente), poi elabora i post in parallelo:
+    args.parallel context nello stesso browser, ognuno con una sola pagina,
+    che si contendono gli URL da una coda.
+    I record restituiti mantengono l'ordine degli URL in input.
+    """
+    records = [None] * len(urls)
+    completed = 0
+
+    ckpt_path = checkpoint_path(args.output)
+
+    disable_playwright_stack_capture()
+    async with async_playwright() as p:
+        state = await login_state(p, download_dir, args.headless)
+
+        # Un solo processo Chromium; ogni context ha cookie e download propri
+        browser = await p.chromium.launch(
+            headless=args.headless,
+            args=LAUNCH_ARGS,
+            downloads_path=str(download_dir),
+        )
+
+        queue = asyncio.Queue()
+        for item in enumerate(urls, start=1):
+            queue.put_nowait(item)
+
+        async def worker():
+            nonlocal completed
+            context = await browser.new_context(storage_state=state, **CONTEXT_OPTIONS)
+            await context.route("**/*", _block_heavy_resources)
+            page = await context.new_page()
+            try:
+                while not queue.empty():
+                    i, url = queue.get_nowait()
+                    print(f"[{i:>3}/{len(urls)}] {url[:90]}")
+                    records[i - 1] = await scrape_post(page, url)
+
+                    ckpt.write(json.dumps(records[i - 1], ensure_ascii=False, default=str) + "\n")
+                    completed += 1
+                    if completed % CHECKPOINT_EVERY == 0:
+                        ckpt.flush()
+                        print(f"  💾 Checkpoint: {completed} record in {ckpt_path}")
+
+                    # Pausa di cortesia prima del post successivo di questo context
+                    if not queue.empty():
+                        await asyncio.sleep(args.delay)
+            finally:
+                await context.close()
+
+        n_workers = min(max(1, args.parallel), len(urls))
+        try:
+            # Checkpoint in append: ogni record viene scritto una sola volta, invece
+            # di riscrivere un xlsx con tutti i record ogni 10 post.
+            # Aperto solo a login e browser pronti: si chiude in ogni caso
+            with open(ckpt_path, "w", encoding="utf-8") as ckpt:
+                await asyncio.gather(*(worker() for _ in range(n_workers)))
+        finally:
+            await browser.close()
+
+    return records
+
+
 # ─── main ─────────────────────────────────────────────────────────────────────
 
 def main():
@@ -658,6 +965,8 @@ def main():
                         help="File Excel di output (default: linkedin_stats_output.xlsx)")
     parser.add_argument("--delay",    "-d", type=float, default=4.0,
                         help="Secondi di attesa tra post (default: 4)")
+    parser.add_argument("--parallel", "-p", type=int, default=MAX_PARALLEL,
+                        help=f"Context del browser in parallelo (default: {MAX_PARALLEL})")
     parser.add_argument("--headless", action="store_true",
                         help="Browser headless (sconsigliato: impedisce il login manuale)")
     args = parser.parse_args()
@@ -684,57 +993,13 @@ def main():
     try:
         download_dir = Path(tmp_dir)
 
-        with sync_playwright() as p:
-            browser = p.chromium.launch(
-                headless=args.headless,
-                args=["--start-maximized"],
-                downloads_path=str(download_dir),
-            )
-            context = browser.new_context(
-                viewport={"width": 1400, "height": 900},
-                accept_downloads=True,
-                user_agent=(
-                    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                    "AppleWebKit/537.36 (KHTML, like Gecko) "
-                    "Chrome/120.0.0.0 Safari/537.36"
-                ),
-            )
-            page = context.new_page()
-
-            print("\n🔐 Apro LinkedIn … Effettua il login nel browser.")
-            print("   (Attendo fino a 3 minuti)\n")
-            page.goto("https://www.linkedin.com/login", wait_until="domcontentloaded")
-
-            try:
-                # Aspetta la barra di ricerca o la foto profilo (senza eval/unsafe-eval)
-                page.wait_for_selector(
-                    ".search-global-typeahead, .global-nav__me-photo, "
-                    "[data-test-global-nav-search], #global-nav-search",
-                    timeout=180000
-                )
-                print("   ✅  Login rilevato – avvio scraping …\n")
-            except PlaywrightTimeout:
-                print("   ⚠️  Timeout login, procedo comunque …\n")
-
-            for i, url in enumerate(urls, start=1):
-                print(f"[{i:>3}/{len(urls)}] {url[:90]}")
-                record = scrape_post(page, url, download_dir)
-                records.append(record)
-
-                # Checkpoint ogni 10 post
-                if i % 10 == 0:
-                    tmp_out = args.output.replace(".xlsx", f"_checkpoint_{i}.xlsx")
-                    save_to_excel(records, tmp_out)
-                    print(f"  💾 Checkpoint: {tmp_out}")
-
-                if i < len(urls):
-                    time.sleep(args.delay)
-
-            browser.close()
+        records = asyncio.run(scrape_all(urls, download_dir, args))
 
         # ── Salvataggio finale PRIMA di chiudere la cartella temporanea ───
         print("\n💾 Salvataggio finale …")
         save_to_excel(records, args.output)
+        # L'xlsx finale contiene tutto: il checkpoint non serve più
+        checkpoint_path(args.output).unlink(missing_ok=True)
 
         errors = [r for r in records if r["error"]]
         if errors:
@@ -25,22 +25,32 @@ UTILIZZO:
   python linkedin_scraper.py --input posts.xlsx --output stats_output.xlsx
 
 REQUISITI:
-  pip install playwright openpyxl pandas
+  pip install playwright openpyxl
   playwright install chromium
 """
 
 import argparse
+import asyncio
+import functools
+import io
+import json
 import sys
-import time
+import threading
 import re
 import tempfile
+import zipfile
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
+from typing import BinaryIO, Union
 
-import pandas as pd # pyre-ignore
+from openpyxl import load_workbook # pyre-ignore
+from openpyxl.styles.numbers import BUILTIN_FORMATS, is_date_format, is_timedelta_format # pyre-ignore
+from openpyxl.utils.datetime import CALENDAR_MAC_1904, CALENDAR_WINDOWS_1900, from_excel, from_ISO8601 # pyre-ignore
 
 try:
-    from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeout # pyre-ignore
+    from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeout # pyre-ignore
 except ImportError:
     print("ERRORE: playwright non installato.")
     print("Esegui: pip install playwright && playwright install chromium")
@@ -50,26 +60,38 @@ except ImportError:
 # ─── utility ──────────────────────────────────────────────────────────────────
 
 def read_input_excel(path: str) -> list:
-    df = pd.read_excel(path, dtype=str)
-    url_col = None
-    for col in df.columns:
-        if any(kw in col.lower() for kw in ("url", "link", "post", "href")):
-            url_col = col
-            break
-    if url_col is None:
-        url_col = df.columns[0]
-    urls = df[url_col].dropna().str.strip().tolist()
+    # Serve una sola colonna: read_only scorre le righe senza caricare
+    # l'intero foglio in memoria
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = _sheet_rows(wb.worksheets[0])
+        headers = [cell_str(h) for h in next(rows, ())]
+        idx = next(
+            (i for i, h in enumerate(headers)
+             if any(kw in h.lower() for kw in ("url", "link", "post", "href"))),
+            0,
+        )
+        urls = [cell_str(r[idx]) for r in rows if len(r) > idx]
+    finally:
+        wb.close()
+    url_col = headers[idx] if headers else ""
     urls = [u for u in urls if u.startswith("http")]
     print(f"  Trovati {len(urls)} URL nella colonna '{url_col}'")
     return urls
 
 
+_URN_RE = re.compile(r"(urn:li:(?:activity|ugcPost):\d+)")
+_ACT_RE = re.compile(r"activity-(\d{10,})")
+_ACTIVITY_URN_RE = re.compile(r"urn:li:activity:(\d{10,})")
+
+
+@functools.lru_cache(maxsize=1024)
 def analytics_url(post_url: str) -> str:
     clean = post_url.strip().rstrip("/")
-    m = re.search(r"(urn:li:(?:activity|ugcPost):\d+)", clean)
+    m = _URN_RE.search(clean)
     if m:
         return f"https://www.linkedin.com/analytics/post-summary/{m.group(1)}/"
-    m = re.search(r"activity-(\d{10,})", clean)
+    m = _ACT_RE.search(clean)
     if m:
         return f"https://www.linkedin.com/analytics/post-summary/urn:li:activity:{m.group(1)}/"
     return clean
@@ -77,92 +99,252 @@ def analytics_url(post_url: str) -> str:
 
 def pct_str(val) -> str:
     """Converte 0.275 → '27.5%'"""
+    if isinstance(val, float):  # caso tipico: cella numerica dell'export
+        return f"{val*100:.1f}%"
+    if isinstance(val, str) and val.endswith("%"):  # già formattato
+        return val
     try:
         return f"{float(val)*100:.1f}%"
     except (ValueError, TypeError):
         return str(val) if val else ""
 
 
+def cell_str(val) -> str:
+    """Valore di una cella openpyxl → stringa ripulita ('' per le celle vuote)."""
+    if val is None:
+        return ""
+    if isinstance(val, float) and val.is_integer():
+        return str(int(val))
+    return str(val).strip()
+
+
+def _sheet_rows(ws):
+    """Righe (tuple di valori) di un foglio aperto in read_only."""
+    # Gli export LinkedIn dichiarano dimensioni errate (A1:A1): senza reset
+    # la modalità read_only restituirebbe solo la prima riga
+    ws.reset_dimensions()
+    return ws.iter_rows(values_only=True)
+
+
+# ─── lettura diretta dell'xlsx (zip + XML) ────────────────────────────────────
+# L'export LinkedIn è minuscolo e a schema fisso: basta leggere gli XML dei
+# fogli, la tabella delle stringhe condivise e i formati numerici degli stili
+# (per le date), senza costruire il modello di openpyxl. Le conversioni delle
+# date restano quelle di openpyxl, così i valori sono gli stessi di iter_rows
+
+_XLSX_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_XLSX_REL_ID = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id"
+_XLSX_PKG_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+_CELL_COL_RE = re.compile(r"[A-Z]+")
+
+
+def _xlsx_sheet_paths(zf: zipfile.ZipFile) -> dict:
+    """Nome foglio → percorso dell'XML nello zip, nell'ordine del workbook."""
+    rels = ET.fromstring(zf.read("xl/_rels/workbook.xml.rels"))
+    targets = {}
+    for rel in rels.iter(f"{_XLSX_PKG_NS}Relationship"):
+        target = rel.get("Target", "")
+        targets[rel.get("Id")] = target.lstrip("/") if target.startswith("/") else f"xl/{target}"
+    workbook = ET.fromstring(zf.read("xl/workbook.xml"))
+    return {
+        sheet.get("name"): targets[sheet.get(_XLSX_REL_ID)]
+        for sheet in workbook.iter(f"{_XLSX_NS}sheet")
+    }
+
+
+def _xlsx_epoch(zf: zipfile.ZipFile):
+    """Data zero del workbook: 1900, oppure 1904 per i file creati su Mac."""
+    pr = ET.fromstring(zf.read("xl/workbook.xml")).find(f"{_XLSX_NS}workbookPr")
+    if pr is not None and pr.get("date1904", "").lower() in ("1", "true"):
+        return CALENDAR_MAC_1904
+    return CALENDAR_WINDOWS_1900
+
+
+def _xlsx_date_styles(zf: zipfile.ZipFile) -> tuple:
+    """Indici degli stili di cella con formato data, e tra questi quelli di durata."""
+    dates, durations = set(), set()
+    if "xl/styles.xml" not in zf.namelist():
+        return dates, durations
+    styles = ET.fromstring(zf.read("xl/styles.xml"))
+    custom = {
+        int(fmt.get("numFmtId")): fmt.get("formatCode", "")
+        for fmt in styles.iter(f"{_XLSX_NS}numFmt")
+    }
+    cell_xfs = styles.find(f"{_XLSX_NS}cellXfs")
+    for i, xf in enumerate(cell_xfs.findall(f"{_XLSX_NS}xf") if cell_xfs is not None else ()):
+        fmt_id = int(xf.get("numFmtId", 0))
+        code = custom.get(fmt_id) or BUILTIN_FORMATS.get(fmt_id)
+        if code and is_date_format(code):
+            dates.add(i)
+            if is_timedelta_format(code):
+                durations.add(i)
+    return dates, durations
+
+
+def _xlsx_shared_strings(zf: zipfile.ZipFile) -> list:
+    if "xl/sharedStrings.xml" not in zf.namelist():
+        return []
+    sst = []
+    for si in ET.fromstring(zf.read("xl/sharedStrings.xml")).iter(f"{_XLSX_NS}si"):
+        # Testo semplice (<t>) o rich text (<r><t>); la fonetica (<rPh>) si ignora
+        texts = [t.text or "" for t in si.findall(f"{_XLSX_NS}t")]
+        texts += [t.text or "" for t in si.findall(f"{_XLSX_NS}r/{_XLSX_NS}t")]
+        sst.append("".join(texts))
+    return sst
+
+
+def _col_index(ref: str) -> int:
+    """'C7' → 2"""
+    idx = 0
+    for ch in _CELL_COL_RE.match(ref).group(0):
+        idx = idx * 26 + ord(ch) - 64
+    return idx - 1
+
+
+def _xlsx_rows(zf: zipfile.ZipFile, member: str, sst: list, date_styles: tuple, epoch):
+    """
+    Righe (tuple di valori, come iter_rows(values_only=True)) di un foglio.
+    date_styles è il risultato di _xlsx_date_styles: i numeri con stile data
+    diventano datetime (o timedelta per le durate), come in openpyxl.
+    """
+    dates, durations = date_styles
+    row_tag = f"{_XLSX_NS}row"
+    with zf.open(member) as f:
+        for _, elem in ET.iterparse(f):
+            if elem.tag != row_tag:
+                continue
+            values = []
+            for c in elem.iter(f"{_XLSX_NS}c"):
+                ref = c.get("r")
+                if ref:
+                    values.extend([None] * (_col_index(ref) - len(values)))
+                kind = c.get("t")
+                v = c.findtext(f"{_XLSX_NS}v")
+                if kind == "s":
+                    val = sst[int(v)]
+                elif kind == "inlineStr":
+                    val = "".join(t.text or "" for t in c.iter(f"{_XLSX_NS}t"))
+                elif v is None:
+                    val = None
+                elif kind in ("str", "e"):
+                    val = v
+                elif kind == "b":
+                    val = v == "1"
+                elif kind == "d":
+                    val = from_ISO8601(v)
+                else:
+                    try:
+                        val = int(v)
+                    except ValueError:
+                        val = float(v)
+                    style = int(c.get("s", 0))
+                    if style in dates:
+                        try:
+                            val = from_excel(val, epoch, timedelta=style in durations)
+                        except (OverflowError, ValueError):
+                            pass  # seriale fuori dall'intervallo delle date: resta il numero
+                values.append(val)
+            elem.clear()
+            yield tuple(values)
+
+
 # ─── parsing del file Excel esportato da LinkedIn ─────────────────────────────
 
-def parse_linkedin_export(xlsx_path: str) -> dict:
+# Campi del foglio RENDIMENTO: (campo risultato, chiavi cercate nelle label)
+KV_FIELDS = (
+    ("post_url_export",  ("url post", "post url")),
+    ("post_date",        ("data di pubblicazione", "publication date")),
+    ("post_time",        ("ora di pubblicazione", "publication time")),
+    ("impressions",      ("impressioni", "impressions")),
+    ("unique_views",     ("utenti raggiunti", "unique viewers", "reach")),
+    ("profile_visits",   ("visitatori del profilo", "profile visitors")),
+    ("followers_gained", ("follower acquisiti", "followers gained")),
+    ("reactions",        ("reazioni", "reactions")),
+    ("comments",         ("commenti", "comments")),
+    ("reposts",          ("diffusioni", "reposts", "reshares")),
+    ("saves",            ("salvataggi", "saves")),
+    ("sends",            ("invii", "sends")),
+)
+
+# Foglio demografico: (campo risultato, categoria cercata, solo prefisso?)
+DEMO_CATEGORIES = (
+    ("demo_seniority",    "anzianit",           False),
+    ("demo_role",         "qualifica",          False),
+    ("demo_industry",     "settore",            False),
+    ("demo_company_size", "dimensioni azienda", False),
+    ("demo_location",     "localit",            False),
+    ("demo_company",      "azienda",            True),
+)
+DEMO_TOP_N = 3
+
+def parse_linkedin_export(xlsx: Union[str, BinaryIO]) -> dict:
     """
-    Legge il file xlsx esportato da LinkedIn e restituisce un dict con
-    tutti i campi estratti dai fogli RENDIMENTO e PRINCIPALI DATI DEMOGRAFICI.
+    Legge il file xlsx esportato da LinkedIn (percorso o stream binario, es.
+    io.BytesIO) e restituisce un dict con tutti i campi estratti dai fogli
+    RENDIMENTO e PRINCIPALI DATI DEMOGRAFICI.
     """
     result = {}
 
+    zf = None
     try:
-        xl = pd.ExcelFile(xlsx_path)
-        sheet_names_lower = {s.lower(): s for s in xl.sheet_names}
+        # Lettura diretta degli XML: il file viene aperto una volta sola
+        zf = zipfile.ZipFile(xlsx)
+        sheets = _xlsx_sheet_paths(zf)
+        sst = _xlsx_shared_strings(zf)
+        date_styles = _xlsx_date_styles(zf)
+        epoch = _xlsx_epoch(zf)
+        sheetnames = list(sheets)
+        sheet_names_lower = {s.lower(): s for s in sheetnames}
 
         # ── Foglio RENDIMENTO ────────────────────────────────────────────────
         rendimento_key = next(
             (v for k, v in sheet_names_lower.items() if "rendimento" in k or "performance" in k),
-            xl.sheet_names[0]
+            sheetnames[0]
         )
         demo_key = next(
             (v for k, v in sheet_names_lower.items() if "demograf" in k or "demographic" in k),
-            xl.sheet_names[1] if len(xl.sheet_names) > 1 else None
+            sheetnames[1] if len(sheetnames) > 1 else None
         )
-        # Leggi tutti i fogli necessari mentre il file è aperto, poi chiudi subito
-        df_r = pd.read_excel(xlsx_path, sheet_name=rendimento_key, header=None, dtype=str)
-        df_d = pd.read_excel(xlsx_path, sheet_name=demo_key, header=0, dtype=str) if demo_key else None
-        xl.close()  # chiude il file handle – fondamentale su Windows
 
-        # Costruiamo un dizionario label→valore dalle coppie colonna 0/colonna 1
+        # Un'unica passata sul foglio: dizionario label→valore dalle coppie
+        # colonna 0/colonna 1 e, insieme, le righe delle sezioni "in evidenza"
+        # (il foglio ha sezioni separate per reazioni e commenti)
         kv = {}
-        for _, row in df_r.iterrows():
-            label = str(row.iloc[0]).strip() if pd.notna(row.iloc[0]) else ""
-            value = str(row.iloc[1]).strip() if pd.notna(row.iloc[1]) else ""
-            if label and label != "nan":
-                kv[label.lower()] = value
-
-        def get(keys: list) -> str:
-            for k in keys:
-                for kv_key, val in kv.items():
-                    if k.lower() in kv_key:
-                        return val if val != "nan" else ""
-            return ""
-
-        result["post_url_export"]   = get(["url post", "post url"])
-        result["post_date"]         = get(["data di pubblicazione", "publication date"])
-        result["post_time"]         = get(["ora di pubblicazione", "publication time"])
-        result["impressions"]       = get(["impressioni", "impressions"])
-        result["unique_views"]      = get(["utenti raggiunti", "unique viewers", "reach"])
-        result["profile_visits"]    = get(["visitatori del profilo", "profile visitors"])
-        result["followers_gained"]  = get(["follower acquisiti", "followers gained"])
-        result["reactions"]         = get(["reazioni", "reactions"])
-        result["comments"]          = get(["commenti", "comments"])
-        result["reposts"]           = get(["diffusioni", "reposts", "reshares"])
-        result["saves"]             = get(["salvataggi", "saves"])
-        result["sends"]             = get(["invii", "sends"])
-
-        # Top reazioni
-        # Il foglio ha sezioni separate per reazioni e commenti
-        # Individuiamo le righe per sezione usando l'indice
-        reaz_section = False
-        comm_section = False
         reaz_rows = []
         comm_rows = []
-        for _, row in df_r.iterrows():
-            label = str(row.iloc[0]).strip().lower() if pd.notna(row.iloc[0]) else ""
-            if "reazioni in evidenza" in label:
-                reaz_section = True
-                comm_section = False
+        section = None
+        for row in _xlsx_rows(zf, sheets[rendimento_key], sst, date_styles, epoch):
+            label = cell_str(row[0]) if row else ""
+            value = cell_str(row[1]) if len(row) > 1 else ""
+            if not label:
                 continue
-            if "commenti in evidenza" in label:
-                comm_section = True
-                reaz_section = False
-                continue
-            if reaz_section and label:
-                reaz_rows.append((str(row.iloc[0]).strip(), str(row.iloc[1]).strip() if pd.notna(row.iloc[1]) else ""))
-            if comm_section and label:
-                comm_rows.append((str(row.iloc[0]).strip(), str(row.iloc[1]).strip() if pd.notna(row.iloc[1]) else ""))
+            label_l = label.lower()
+            kv[label_l] = value
+            if "reazioni in evidenza" in label_l:
+                section = reaz_rows
+            elif "commenti in evidenza" in label_l:
+                section = comm_rows
+            elif section is not None:
+                section.append((label, value))
+
+        # Una sola passata su kv per tutti i campi. A parità di campo vince la
+        # chiave di ricerca elencata prima, poi la prima riga del foglio
+        best_rank = {}
+        for kv_key, val in kv.items():
+            for field, needles in KV_FIELDS:
+                for rank, needle in enumerate(needles):
+                    if rank >= best_rank.get(field, len(needles)):
+                        break
+                    if needle in kv_key:
+                        result[field] = val
+                        best_rank[field] = rank
+                        break
+        for field, _ in KV_FIELDS:
+            result.setdefault(field, "")
 
         def section_val(rows, keyword):
             for label, val in rows:
-                if keyword.lower() in label.lower() and val and val != "nan":
+                if keyword.lower() in label.lower() and val:
                     return val
             return ""
 
@@ -174,49 +356,80 @@ def parse_linkedin_export(xlsx_path: str) -> dict:
         result["comments_top_industry"]  = section_val(comm_rows, "settore")
 
         # ── Foglio PRINCIPALI DATI DEMOGRAFICI ──────────────────────────────
-        if df_d is not None:
-            # Colonne: Categoria | Valore | %
-            col_cat = df_d.columns[0] # pyre-ignore
-            col_val = df_d.columns[1] # pyre-ignore
-            col_pct = df_d.columns[2] # pyre-ignore
-
-            def top_demo(category_kw: str, n: int = 3) -> str:
-                mask = df_d[col_cat].str.lower().str.contains(category_kw, na=False) # pyre-ignore
-                sub = df_d[mask].head(n) # pyre-ignore
-                parts = []
-                for _, row in sub.iterrows():
-                    val = str(row[col_val]).strip()
-                    pct = pct_str(row[col_pct])
-                    if val and val != "nan":
-                        parts.append(f"{val} ({pct})")
-                return " | ".join(parts)
-
-            result["demo_seniority"]    = top_demo("anzianit")
-            result["demo_role"]         = top_demo("qualifica")
-            result["demo_industry"]     = top_demo("settore")
-            result["demo_company_size"] = top_demo("dimensioni azienda")
-            result["demo_location"]     = top_demo("localit")
-            result["demo_company"]      = top_demo("^azienda")
+        if demo_key:
+            # Colonne: Categoria | Valore | %  (la prima riga è l'intestazione).
+            # Una sola passata: ogni riga finisce nei bucket delle categorie
+            # che la contengono, fino a DEMO_TOP_N righe per categoria
+            buckets = {field: [] for field, _, _ in DEMO_CATEGORIES}
+            rows = _xlsx_rows(zf, sheets[demo_key], sst, date_styles, epoch)
+            next(rows, None)
+            for r in rows:
+                if not r:
+                    continue
+                cat = cell_str(r[0]).lower()
+                if not cat:
+                    continue
+                for field, kw, prefix in DEMO_CATEGORIES:
+                    bucket = buckets[field]
+                    if len(bucket) < DEMO_TOP_N and (cat.startswith(kw) if prefix else kw in cat):
+                        bucket.append((cell_str(r[1]) if len(r) > 1 else "", r[2] if len(r) > 2 else None))
+
+            for field, bucket in buckets.items():
+                result[field] = " | ".join(f"{val} ({pct_str(pct)})" for val, pct in bucket if val)
 
     except Exception as exc:
         result["parse_error"] = str(exc)[:200] # pyre-ignore
         print(f"    ✗ Errore parsing export: {exc}")
+    finally:
+        if zf is not None:
+            zf.close()  # chiude il file handle – fondamentale su Windows
 
     return result
 
 
 # ─── estrazione testo post dalla pagina ───────────────────────────────────────
 
+# Pattern statici, compilati una volta sola all'import
+SCOPERTA_SPLIT_RE = re.compile(r"\nScoperta\n")
+ANALYTICS_HEADER_RE = re.compile(r".+ha pubblicato questo post\s*[•·]\s*\S+\n?")
+AUTHOR_HEADER_RE = re.compile(
+    r"ha pubblicato questo post\s*[•·][^\n]*\n"   # header autore
+    r"(?:[^\n]*\n){0,3}"                           # eventuali righe accessorie
+)
+HASHTAG_RE = re.compile(r"\nhashtag\n")
+SEE_MORE_RE = re.compile(r"[…\.]{3}visualizza altro\s*")
+SEE_MORE_TAIL_RE = re.compile(r"[…\.]{3}visualizza altro\s*$")
+
+# Indicatori di fine post (inizio commenti / reazioni), in un'unica
+# alternanza: una sola scansione, vince il match più a sinistra
+END_MARKERS_RE = re.compile(
+    "|".join(f"(?:{m})" for m in (
+        r"\nReazioni\n",
+        r"\nCommenti\n",
+        r"\nAggiungi un commento",
+        r"\nRispondi",
+        r"\nMi piace\s*\n",
+        r"\nCondividi\n",
+        r"\nInvia\n",
+        r"\nPost correlati",
+        r"\nPotrebbe interessarti",
+        r"\nAltri post di",
+        r"\n\d+ reazioni?\n",
+        r"\n\d+ commenti?\n",
+    )),
+    re.IGNORECASE,
+)
+
 def extract_post_text(page_text: str) -> str:
     """
     Estrae il testo del post dalla pagina analytics (prima di 'Scoperta').
     Usata come fallback se la visita al post originale fallisce.
     """
-    parts = re.split(r"\nScoperta\n", page_text, maxsplit=1)
+    parts = SCOPERTA_SPLIT_RE.split(page_text, maxsplit=1)
     if len(parts) < 2:
         return ""
     block = parts[0]
-    m = re.search(r".+ha pubblicato questo post\s*[•·]\s*\S+\n?", block)
+    m = ANALYTICS_HEADER_RE.search(block)
     if m:
         end_idx = int(m.end())
         block = str(block)[end_idx:] # pyre-ignore
@@ -225,11 +438,8 @@ def extract_post_text(page_text: str) -> str:
         start = next((i for i, l in enumerate(lines) if len(l.strip()) > 30 and i > 5), 0)
         start_idx = int(start)
         block = "\n".join(lines[start_idx:]) # pyre-ignore
-    block = re.sub(r"\nhashtag\n", " ", block)
-    block = re.sub(r"[…\.]{3}visualizza altro\s*$", "", block)
-    half = len(block) // 2
-    if block[:50].strip() and block[half:half+50].strip().startswith(block[:30].strip()): # pyre-ignore
-        block = block[:half] # pyre-ignore
+    block = HASHTAG_RE.sub(" ", block)
+    block = SEE_MORE_TAIL_RE.sub("", block)
     return block.strip()
 
 
@@ -240,18 +450,10 @@ def extract_post_text_from_post_page(page_text: str) -> str:
     La pagina del post ha struttura diversa da quella analytics:
     il testo si trova tra l'header autore e la sezione commenti/reazioni.
     """
-    # Sanity check for "Page not found" or "Questa pagina non esiste" LinkedIn error pages
-    if "Questa pagina non esiste" in page_text or "Page not found" in page_text:
-        return "[PAGE NOT FOUND]"
-
     # Rimuovi rumore di navigazione iniziale (barra nav, notifiche, ecc.)
     # Cerca l'inizio del post: di solito dopo "• Xh" o "• Xm" (tempo relativo)
     # oppure dopo una data tipo "17 nov"
-    m = re.search(
-        r"ha pubblicato questo post\s*[•·][^\n]*\n"   # header autore
-        r"(?:[^\n]*\n){0,3}",                           # eventuali righe accessorie
-        page_text
-    )
+    m = AUTHOR_HEADER_RE.search(page_text)
     if m:
         end_idx = int(m.end())
         block = str(page_text)[end_idx:] # pyre-ignore
@@ -262,31 +464,17 @@ def extract_post_text_from_post_page(page_text: str) -> str:
         block = "\n".join(lines[start:]) # pyre-ignore
 
     # Il testo del post finisce quando cominciano i commenti / reazioni
-    # Indicatori di fine post:
-    end_markers = [
-        r"\nReazioni\n",
-        r"\nCommenti\n",
-        r"\nAggiungi un commento",
-        r"\nRispondi",
-        r"\nMi piace\s*\n",
-        r"\nCondividi\n",
-        r"\nInvia\n",
-        r"\nPost correlati",
-        r"\nPotrebbe interessarti",
-        r"\nAltri post di",
-        r"\n\d+ reazioni?\n",
-        r"\n\d+ commenti?\n",
-    ]
-    earliest = len(block)
-    for marker in end_markers:
-        m2 = re.search(marker, block, re.IGNORECASE)
-        if m2 and m2.start() < earliest:
-            earliest = m2.start()
+    m2 = END_MARKERS_RE.search(block)
+    earliest = m2.start() if m2 else len(block)
     block = block[:earliest] # pyre-ignore
 
-    # Pulizia
-    block = re.sub(r"\nhashtag\n", " ", block)
-    block = re.sub(r"[…\.]{3}visualizza altro\s*", "", block)
+    return clean_post_block(block)
+
+
+def clean_post_block(block: str) -> str:
+    """Pulizia finale del testo del post ('' se troppo corto per essere valido)."""
+    block = HASHTAG_RE.sub(" ", block)
+    block = SEE_MORE_RE.sub("", block)
     block = block.strip()
 
     # Sanity check: se troppo corto, probabilmente qualcosa è andato storto
@@ -298,7 +486,84 @@ def extract_post_text_from_post_page(page_text: str) -> str:
 
 # ─── scraping principale ──────────────────────────────────────────────────────
 
-def scrape_post(page, post_url: str, download_dir: Path) -> dict:
+# Il contenuto del post è nel DOM (sostituisce le pause fisse dopo goto)
+POST_READY_SELECTOR = "article, .feed-shared-update-v2, [data-urn]"
+
+# Clicca (una volta sola ciascuno) i pulsanti "visualizza altro" / "see more"
+# visibili e restituisce quanti ne ha cliccati
+SEE_MORE_CLICK_JS = """() => {
+    const btns = new Set([
+        ...document.querySelectorAll(
+            "button.feed-shared-inline-show-more-text__see-more-less-toggle, "
+            + "[aria-label*='visualizza altro']"
+        ),
+        ...[...document.querySelectorAll('button')].filter(
+            b => /visualizza altro|see more/i.test(b.innerText)
+        ),
+    ]);
+    let clicked = 0;
+    for (const b of btns) {
+        if (b.offsetParent) { b.click(); clicked++; }
+    }
+    return clicked;
+}"""
+
+# Contenitore del solo testo del post
+POST_BODY_SELECTOR = "div.feed-shared-update-v2__description, .update-components-text"
+
+# True quando non resta nessun toggle "visualizza altro" ancora da espandere
+SEE_MORE_EXPANDED_JS = """() => ![...document.querySelectorAll(
+    'button.feed-shared-inline-show-more-text__see-more-less-toggle'
+)].some(b => b.offsetParent && /visualizza altro|see more/i.test(b.innerText))"""
+
+# Pulsante "Esporta" della pagina analytics: tutte le varianti in un solo
+# selettore, così basta un round-trip per trovare il primo visibile
+EXPORT_SELECTOR = (
+    "button:has-text('Esporta'), button:has-text('Export'), "
+    "[aria-label*='Esporta'], [aria-label*='Export']"
+)
+# Ultima risorsa, provata solo se nessun pulsante compare: in un'unione
+# l'ordine è quello del DOM, e un testo qualsiasi vincerebbe sul pulsante
+EXPORT_TEXT_SELECTOR = ":text('Esporta'), :text('Export')"
+
+# Primo URN "urn:li:activity:<id>" nell'HTML, cercato dentro la pagina:
+# attraversa CDP solo l'URN, non l'intero documento
+ACTIVITY_URN_JS = r"""() => {
+    const m = document.documentElement.outerHTML.match(/urn:li:activity:\d{10,}/);
+    return m ? m[0] : null;
+}"""
+
+# Errori di sessione: il primo lo imposta scrape_post, il secondo è quello
+# restituito al chiamante quando serve (di nuovo) il login
+LOGIN_REDIRECT_ERROR = "Redirect al login – sessione scaduta"
+LOGIN_REQUIRED_ERROR = "Login required. Run without headless mode first."
+
+def _is_login_redirect(url: str) -> bool:
+    return any(x in url for x in ("authwall", "/login", "checkpoint", "uas/authenticate"))
+
+# Pagina d'errore di LinkedIn (post eliminato o URL errato): la regex gira
+# nella pagina, dall'intero body torna indietro solo un booleano
+_DEAD_PAGE_TEST = "/Questa pagina non esiste|Page not found/.test(document.body ? document.body.innerText : '')"
+DEAD_PAGE_JS = f"() => {_DEAD_PAGE_TEST}"
+
+# Post pronto oppure pagina d'errore: una pagina morta non attende il timeout
+POST_READY_OR_DEAD_JS = f"() => !!document.querySelector({POST_READY_SELECTOR!r}) || {_DEAD_PAGE_TEST}"
+
+# Regione principale della pagina: esclude navbar, sidebar e post suggeriti
+MAIN_REGION_SELECTOR = "main, [role='main']"
+
+async def _main_text(page) -> str:
+    """Testo della regione principale; l'intero body solo se la pagina non ne ha una."""
+    region = page.locator(MAIN_REGION_SELECTOR).first
+    if await region.count():
+        return await region.inner_text()
+    return await page.inner_text("body")
+
+async def scrape_post(page, post_url: str, parse_pool=None) -> dict:
+    """
+    Scrapes one post. The downloaded export is parsed on parse_pool (an
+    Executor, default one if None) so other pages keep loading meanwhile.
+    """
     result = {
         "post_url":              post_url,
         "analytics_url":         "",
@@ -335,21 +600,31 @@ def scrape_post(page, post_url: str, download_dir: Path) -> dict:
         
         # ── 1. Visita prima il post originale per estrarre il testo e l'URL Analytics corretto ──────────
         try:
-            page.goto(post_url, wait_until="domcontentloaded", timeout=20000)
-            time.sleep(3)
+            await page.goto(post_url, wait_until="domcontentloaded", timeout=20000)
+            try:
+                await page.wait_for_function(POST_READY_OR_DEAD_JS, timeout=10000, polling=250)
+            except PlaywrightTimeout:
+                pass
 
             # Controllo redirect login
-            if any(x in page.url for x in ("authwall", "/login", "checkpoint", "uas/authenticate")):
-                result["error"] = "Redirect al login – sessione scaduta"
+            if _is_login_redirect(page.url):
+                result["error"] = LOGIN_REDIRECT_ERROR
                 print("    ✗ Redirect login")
                 return result
 
+            # Pagina d'errore: controllata sempre e sull'intero body, prima di
+            # qualsiasi estrazione (l'avviso può stare fuori da main)
+            if await page.evaluate(DEAD_PAGE_JS):
+                result["error"] = "Post non trovato o eliminato"
+                print("    ✗ Post non trovato")
+                return result
+
             # Estrai l'URL Analytics corretto dalla pagina o dalla navigazione
             try:
                 # 1. Cerca il link del pulsante "Visualizza analisi" (se presente)
-                analytics_link = page.query_selector("a[href*='/analytics/post-summary/']")
+                analytics_link = await page.query_selector("a[href*='/analytics/post-summary/']")
                 if analytics_link:
-                    href = analytics_link.get_attribute("href")
+                    href = await analytics_link.get_attribute("href")
                     if href:
                         a_url = href if href.startswith("http") else f"https://www.linkedin.com{href}"
             except Exception:
@@ -358,48 +633,42 @@ def scrape_post(page, post_url: str, download_dir: Path) -> dict:
             if not a_url:
                 # 2. Se l'URL finale della pagina è cambiato in activity-...
                 if "activity-" in page.url:
-                    m = re.search(r"activity-(\d{10,})", page.url)
+                    m = _ACT_RE.search(page.url)
                     if m:
                         a_url = f"https://www.linkedin.com/analytics/post-summary/urn:li:activity:{m.group(1)}/"
             
             if not a_url:
                 # 3. Cerca l'URN dell'attività direttamente nel codice HTML (meta tags)
-                html = page.content()
-                m = re.search(r"urn:li:activity:\d{10,}", html)
-                if m:
-                    a_url = f"https://www.linkedin.com/analytics/post-summary/{m.group(0)}/"
+                urn = await page.evaluate(ACTIVITY_URN_JS)
+                if urn:
+                    a_url = f"https://www.linkedin.com/analytics/post-summary/{urn}/"
             
             # 4. Fallback (vecchio metodo regex stringa)
             if not a_url:
                 a_url = analytics_url(post_url)
 
-            # Clicca tutti i pulsanti "visualizza altro" / "see more" presenti per leggere il testo
-            for see_more_sel in [
-                "button.feed-shared-inline-show-more-text__see-more-less-toggle",
-                "button:has-text('visualizza altro')",
-                "button:has-text('…visualizza altro')",
-                "button:has-text('see more')",
-                "[aria-label*='visualizza altro']",
-            ]:
+            # Clicca tutti i pulsanti "visualizza altro" / "see more" presenti per
+            # leggere il testo: un solo round-trip, i click avvengono nella pagina
+            try:
+                clicked = await page.evaluate(SEE_MORE_CLICK_JS) > 0
+            except Exception:
+                clicked = False
+
+            # Un'unica attesa: finché resta un toggle "visualizza altro" visibile
+            if clicked:
                 try:
-                    btns = page.query_selector_all(see_more_sel)
-                    for btn in btns:
-                        if btn.is_visible():
-                            btn.click()
-                            time.sleep(0.5)
-                except Exception:
+                    await page.wait_for_function(SEE_MORE_EXPANDED_JS, timeout=2000)
+                except PlaywrightTimeout:
                     pass
 
-            time.sleep(1)
-            post_page_text = page.inner_text("body")
-            
-            # Check for dead page before extracting
-            if "Questa pagina non esiste" in post_page_text or "Page not found" in post_page_text:
-                result["error"] = "Post non trovato o eliminato"
-                print("    ✗ Post non trovato")
-                return result
-                
-            result["post_text"] = extract_post_text_from_post_page(post_page_text)
+            # Solo il sottoalbero della descrizione (pochi KB invece dell'intero
+            # body); la regione principale resta come fallback
+            body_loc = page.locator(POST_BODY_SELECTOR).first
+            if await body_loc.count():
+                result["post_text"] = clean_post_block(await body_loc.inner_text(timeout=5000))
+
+            if not result["post_text"]:
+                result["post_text"] = extract_post_text_from_post_page(await _main_text(page))
         except Exception as e_txt:
             print(f"    ⚠ Impossibile leggere testo dal post originale: {e_txt}")
             result["post_text"] = ""
@@ -410,75 +679,45 @@ def scrape_post(page, post_url: str, download_dir: Path) -> dict:
         print(f"    → Analytics: {a_url}")
 
         # ── 2. Naviga alla pagina analytics, trovata dinamicamente ─────────────
-        page.goto(a_url, wait_until="domcontentloaded", timeout=30000)
-        try:
-            page.wait_for_selector(
-                "button:has-text('Esporta'), button:has-text('Export'), "
-                "[aria-label*='Esporta'], [aria-label*='Export']",
-                timeout=15000
-            )
-        except PlaywrightTimeout:
-            pass
-        time.sleep(3)
-
-        page_text = page.inner_text("body")  # usato nel fallback stats
+        await page.goto(a_url, wait_until="domcontentloaded", timeout=30000)
+        if _is_login_redirect(page.url):
+            result["error"] = LOGIN_REDIRECT_ERROR
+            print("    ✗ Redirect login")
+            return result
 
         # ── 4. Clicca "Esporta" e intercetta il download ──────────────────
-        export_btn = None
-        for selector in [
-            "button:has-text('Esporta')",
-            "button:has-text('Export')",
-            "[aria-label*='Esporta']",
-            "[aria-label*='Export']",
-            "text=Esporta",
-            "text=Export",
-        ]:
-            try:
-                btn = page.query_selector(selector)
-                if btn and btn.is_visible():
-                    export_btn = btn
-                    break
-            except Exception:
-                pass
+        # Un solo wait sul primo pulsante visibile: attesa e ricerca insieme
+        export_btn = page.locator(f"{EXPORT_SELECTOR} >> visible=true").first
+        try:
+            await export_btn.wait_for(state="visible", timeout=15000)
+        except PlaywrightTimeout:
+            fallback = page.locator(f"{EXPORT_TEXT_SELECTOR} >> visible=true").first
+            export_btn = fallback if await fallback.count() else None
 
         if not export_btn:
             result["error"] = "Pulsante Esporta non trovato"
             print("    ✗ Pulsante Esporta non trovato")
             # Fallback: prova a estrarre le stats dal testo della pagina
-            _fill_stats_from_text(result, page_text)
+            # (il testo si legge solo qui, quando serve davvero)
+            _fill_stats_from_text(result, await _main_text(page))
             return result
 
         # Intercetta il download
-        with page.expect_download(timeout=30000) as download_info:
-            export_btn.click() # pyre-ignore
+        async with page.expect_download(timeout=30000) as download_info:
+            await export_btn.click() # pyre-ignore
 
-        download = download_info.value
+        download = await download_info.value
 
-        # Salva il file nella cartella temporanea
-        file_name = download.suggested_filename or f"export_{int(time.time())}.xlsx"
-        save_path = download_dir / file_name
-        download.save_as(str(save_path))
+        # Il browser ha già scritto il file nella cartella dei download:
+        # lo leggiamo in memoria una volta sola, senza copiarlo con save_as
+        file_name = download.suggested_filename or "export.xlsx"
+        export_bytes = (await download.path()).read_bytes()
+        await download.delete()
         print(f"    ↓ Download: {file_name}")
 
         # ── 5. Parsa il file scaricato ─────────────────────────────────────
-        export_data = parse_linkedin_export(str(save_path))
-        result.update(export_data)
-
-        # L'URL nel file export può differire (ugcPost vs activity); teniamo l'originale
-        result["post_url"] = post_url
-
-        # Pulizia file temporaneo
-        try:
-            save_path.unlink()
-        except Exception:
-            pass
-
-        print(
-            f"    ✓  impr={result['impressions'] or '—':>6}  "
-            f"reach={result['unique_views'] or '—':>6}  "
-            f"react={result['reactions'] or '—':>4}  "
-            f"comm={result['comments'] or '—':>3}  "
-            f"testo={len(result['post_text'])}ch"
+        await asyncio.get_running_loop().run_in_executor(
+            parse_pool, _apply_export, result, export_bytes, post_url
         )
 
     except PlaywrightTimeout:
@@ -491,120 +730,278 @@ def scrape_post(page, post_url: str, download_dir: Path) -> dict:
     return result
 
 
+THOUSANDS_RE = re.compile(r"[.,](?=\d{3}(?!\d))")
+# Etichette a inizio riga → campo; "Scoperta"/"Impressioni" possono stare
+# anche a metà riga. Un solo pattern, una sola scansione del testo
+LINE_STATS = {
+    "Reazioni":          "reactions",
+    "Commenti":          "comments",
+    "Diffusioni post":   "reposts",
+    "Salvataggi":        "saves",
+    "Invii su LinkedIn": "sends",
+}
+INLINE_STATS = {"Scoperta": "impressions", "Impressioni": "unique_views"}
+STATS_RE = re.compile(
+    rf"(?:^({'|'.join(map(re.escape, LINE_STATS))})|({'|'.join(INLINE_STATS)}))\n+([\d\.,]+)",
+    re.MULTILINE,
+)
+
+
+def _apply_export(result: dict, export_bytes: bytes, post_url: str):
+    """Parsa l'export scaricato (già in memoria) dentro result."""
+    export_data = parse_linkedin_export(io.BytesIO(export_bytes))
+    result.update(export_data)
+
+    # L'URL nel file export può differire (ugcPost vs activity); teniamo l'originale
+    result["post_url"] = post_url
+
+    print(
+        f"    ✓  impr={result['impressions'] or '—':>6}  "
+        f"reach={result['unique_views'] or '—':>6}  "
+        f"react={result['reactions'] or '—':>4}  "
+        f"comm={result['comments'] or '—':>3}  "
+        f"testo={len(result['post_text'])}ch"
+    )
+
+
+def strip_thousands(num: str) -> str:
+    """'1.234' → '1234'. Il regex serve solo se c'è un separatore (es. '1,5' resta invariato)."""
+    if "." not in num and "," not in num:
+        return num
+    return THOUSANDS_RE.sub("", num)
+
+
 def _fill_stats_from_text(result: dict, text: str):
     """Fallback: estrae statistiche dal testo della pagina se il download fallisce."""
-    def after(label):
-        m = re.search(rf"^{re.escape(label)}\n+([\d\.,]+)", text, re.MULTILINE)
-        return re.sub(r"[.,](?=\d{{3}}(?!\d))", "", m.group(1)) if m else ""
+    # Vale la prima occorrenza di ogni etichetta
+    found = {}
+    for m in STATS_RE.finditer(text):
+        field = LINE_STATS[m.group(1)] if m.group(1) else INLINE_STATS[m.group(2)]
+        if field not in found:
+            found[field] = strip_thousands(m.group(3))
+            if len(found) == len(LINE_STATS) + len(INLINE_STATS):
+                break
+
+    for field in LINE_STATS.values():
+        result[field] = found.pop(field, "")
+    result.update(found)
 
-    m = re.search(r"Scoperta\n+([\d\.,]+)", text)
-    if m: result["impressions"] = re.sub(r"[.,](?=\d{3}(?!\d))", "", m.group(1))
-    m = re.search(r"Impressioni\n+([\d\.,]+)", text)
-    if m: result["unique_views"] = re.sub(r"[.,](?=\d{3}(?!\d))", "", m.group(1))
-    result["reactions"] = after("Reazioni")
-    result["comments"]  = after("Commenti")
-    result["reposts"]   = after("Diffusioni post")
-    result["saves"]     = after("Salvataggi")
-    result["sends"]     = after("Invii su LinkedIn")
+
+# Pagine elaborate in parallelo nello stesso context del browser
+MAX_PARALLEL_PAGES = 3
+
+CONTEXT_ARGS = {
+    "viewport": {"width": 1400, "height": 900},
+    "accept_downloads": True,
+    "user_agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/120.0.0.0 Safari/537.36"
+    )
+}
+
+LOGGED_IN_SELECTOR = (
+    ".search-global-typeahead, .global-nav__me-photo, "
+    "[data-test-global-nav-search], #global-nav-search"
+)
 
 
 class LinkedInScraper:
     """Class wrapper for the LinkedIn scraper to integrate with the agent"""
-    def __init__(self, headless: bool = False, delay: float = 4.0):
+    def __init__(self, headless: bool = False, delay: float = 4.0, parallel: int = MAX_PARALLEL_PAGES):
         self.headless = headless
         self.delay = delay
+        self.parallel = parallel
         self.auth_file = Path(__file__).parent.parent / "data" / "auth.json"
 
-    def scrape_urls(self, urls: list[str]) -> list[dict]:
-        """Scrape a list of LinkedIn post URLs and return extracted data dicts."""
-        records = []
-        tmp_dir_obj = tempfile.TemporaryDirectory(ignore_cleanup_errors=True)
-        tmp_dir = tmp_dir_obj.name
-        
-        try:
-            download_dir = Path(tmp_dir)
+        # The async Playwright objects live on a private event loop running in a
+        # background thread. The browser is started lazily on the first
+        # scrape_urls() call and stays open (logged in) until close()
+        self._loop = None
+        self._loop_thread = None
+        self._pw = None
+        self._browser = None
+        self._context = None
+        self._tmp_dir_obj = None
+        # Export parsing runs here, overlapping the other pages' loads
+        self._parse_pool = None
+        # One batch at a time: the instance may be shared (e.g. cached by the GUI)
+        self._lock = threading.Lock()
+
+    def _run(self, coro):
+        """Runs a coroutine on the scraper's event loop and waits for its result."""
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+            self._loop_thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+            self._loop_thread.start()
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    async def _ensure_context(self):
+        """
+        Launches the browser once and returns the context to scrape with,
+        waiting for a manual login if needed. Only a logged-in context is kept
+        for the next calls: otherwise the login is offered again next time.
+        Returns None if headless and not logged in.
+        """
+        if self._context is not None:
+            return self._context
 
-            with sync_playwright() as p:
-                browser = p.chromium.launch(
+        try:
+            if self._browser is None:
+                self._tmp_dir_obj = tempfile.TemporaryDirectory(ignore_cleanup_errors=True)
+                self._parse_pool = ThreadPoolExecutor(max_workers=2)
+                self._pw = await async_playwright().start()
+                self._browser = await self._pw.chromium.launch(
                     headless=self.headless,
                     args=["--start-maximized"],
-                    downloads_path=str(download_dir),
+                    downloads_path=self._tmp_dir_obj.name,
                 )
-                # If auth file exists, load it
-                context_args = {
-                    "viewport": {"width": 1400, "height": 900},
-                    "accept_downloads": True,
-                    "user_agent": (
-                        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                        "AppleWebKit/537.36 (KHTML, like Gecko) "
-                        "Chrome/120.0.0.0 Safari/537.36"
-                    )
-                }
-                
-                if self.auth_file.exists():
-                    print("🔄 Caricamento sessione salvata...")
-                    context_args["storage_state"] = str(self.auth_file)
-                    
-                context = browser.new_context(**context_args)
-                page = context.new_page()
+            context_args = dict(CONTEXT_ARGS)
 
+            # If auth file exists, load it
+            has_saved_session = self.auth_file.exists()
+            if has_saved_session:
+                print("🔄 Caricamento sessione salvata...")
+                context_args["storage_state"] = str(self.auth_file)
+
+            context = await self._browser.new_context(**context_args)
+            page = await context.new_page()
+
+            # Check if we are logged in by looking for global nav.
+            # Without a saved session there is nothing to check: skip the feed visit
+            is_logged_in = False
+            if has_saved_session:
                 print("\n🔐 Apro LinkedIn ...")
-                page.goto("https://www.linkedin.com/feed/", wait_until="domcontentloaded")
-                
-                # Check if we are logged in by looking for global nav
-                is_logged_in = False
+                await page.goto("https://www.linkedin.com/feed/", wait_until="domcontentloaded")
                 try:
-                    page.wait_for_selector(
-                        ".search-global-typeahead, .global-nav__me-photo, "
-                        "[data-test-global-nav-search], #global-nav-search",
-                        timeout=5000
-                    )
+                    await page.wait_for_selector(LOGGED_IN_SELECTOR, timeout=5000)
                     is_logged_in = True
                     print("   ✅  Login attivo rilevato – avvio scraping …\n")
                 except PlaywrightTimeout:
                     is_logged_in = False
 
-                # If headless is True but we aren't logged in, fail fast rather than stalling
-                if not is_logged_in and self.headless:
-                    print("   ❌ Errore: Sessione inesistente o scaduta.")
-                    print("      Disattiva 'Run in Background' e lancia lo scraping per effettuare il login!")
-                    return [{"post_url": u, "error": "Login required. Run without headless mode first."} for u in urls]
-                
-                # If visible and not logged in, give the user time to do it manually
-                if not is_logged_in and not self.headless:
-                    print("   👀 Attendo fino a 3 minuti per permetterti di fare il login manualmente...")
-                    page.goto("https://www.linkedin.com/login", wait_until="domcontentloaded")
-                    try:
-                        page.wait_for_selector(
-                            ".search-global-typeahead, .global-nav__me-photo, "
-                            "[data-test-global-nav-search], #global-nav-search",
-                            timeout=180000
-                        )
-                        print("   ✅  Login manuale rilevato!")
-                        # Save the state for future headless runs!
-                        self.auth_file.parent.mkdir(exist_ok=True)
-                        context.storage_state(path=str(self.auth_file))
-                        print("   💾 Sessione salvata con successo per i futuri avvii in background!")
-                    except PlaywrightTimeout:
-                        print("   ⚠️  Timeout login, procedo comunque (potrebbe fallire o richiedere authwall) …\n")
-
-                for i, url in enumerate(urls, start=1):
-                    print(f"[{i:>3}/{len(urls)}] {url[:90]}")
-                    record = scrape_post(page, url, download_dir)
-                    records.append(record)
-
-                    if i < len(urls):
-                        time.sleep(self.delay)
-
-                browser.close()
+            # If headless is True but we aren't logged in, fail fast rather than stalling
+            if not is_logged_in and self.headless:
+                print("   ❌ Errore: Sessione inesistente o scaduta.")
+                print("      Disattiva 'Run in Background' e lancia lo scraping per effettuare il login!")
+                await self._shutdown()
+                return None
+
+            # If visible and not logged in, give the user time to do it manually
+            if not is_logged_in and not self.headless:
+                print("   👀 Attendo fino a 3 minuti per permetterti di fare il login manualmente...")
+                await page.goto("https://www.linkedin.com/login", wait_until="domcontentloaded")
+                try:
+                    await page.wait_for_selector(LOGGED_IN_SELECTOR, timeout=180000)
+                    print("   ✅  Login manuale rilevato!")
+                    is_logged_in = True
+                except PlaywrightTimeout:
+                    print("   ⚠️  Timeout login, procedo comunque (potrebbe fallire o richiedere authwall) …\n")
+
+            if is_logged_in:
+                # Save (or refresh: LinkedIn rotates its cookies) the state for
+                # future runs, so they can skip the manual login entirely
+                self.auth_file.parent.mkdir(exist_ok=True)
+                await context.storage_state(path=str(self.auth_file))
+                print("   💾 Sessione salvata con successo per i futuri avvii in background!")
+                self._context = context
+
+            await page.close()
+            return context
+        except BaseException:
+            # Nothing half-started survives a failed launch or login check
+            await self._shutdown()
+            raise
+
+    async def _scrape(self, urls: list[str]) -> list[dict]:
+        context = await self._ensure_context()
+        if context is None:
+            return [{"post_url": u, "error": LOGIN_REQUIRED_ERROR} for u in urls]
+
+        records = [None] * len(urls)
+        completed = 0
+        sem = asyncio.Semaphore(max(1, self.parallel))
+
+        async def worker(i: int, url: str):
+            nonlocal completed
+            async with sem:
+                print(f"[{i:>3}/{len(urls)}] {url[:90]}")
+                page = await context.new_page()
+                try:
+                    records[i - 1] = await scrape_post(page, url, self._parse_pool)
+                finally:
+                    await page.close()
 
+                # Courtesy pause: keeps the slot busy before the next post
+                completed += 1
+                if completed < len(urls):
+                    await asyncio.sleep(self.delay)
+
+        try:
+            await asyncio.gather(*(worker(i, url) for i, url in enumerate(urls, start=1)))
         finally:
+            # A context that was never (or is no longer) logged in is not reused:
+            # the next call checks the session again and offers the login
+            logged_out = any(r and r.get("error") == LOGIN_REDIRECT_ERROR for r in records)
+            if context is not self._context or logged_out:
+                if context is self._context:
+                    self._context = None
+                await context.close()
+
+        if logged_out:
+            for r in records:
+                if r.get("error") == LOGIN_REDIRECT_ERROR:
+                    r["error"] = LOGIN_REQUIRED_ERROR
+        return records
+
+    async def _shutdown(self):
+        if self._browser is not None:
+            await self._browser.close()
+        if self._pw is not None:
+            await self._pw.stop()
+        self._pw = self._browser = self._context = None
+        if self._parse_pool is not None:
+            self._parse_pool.shutdown(wait=True)
+            self._parse_pool = None
+        if self._tmp_dir_obj is not None:
             try:
-                tmp_dir_obj.cleanup()
+                self._tmp_dir_obj.cleanup()
             except Exception:
                 pass
-                
-        return records
+            self._tmp_dir_obj = None
+
+    def scrape_urls(self, urls: list[str]) -> list[dict]:
+        """Scrape a list of LinkedIn post URLs and return extracted data dicts."""
+        if not urls:
+            return []
+        with self._lock:
+            return self._run(self._scrape(urls))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        """Closes the browser, removes the download folder and stops the event loop."""
+        with self._lock:
+            if self._loop is None:
+                return
+            try:
+                self._run(self._shutdown())
+            finally:
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                self._loop_thread.join()
+                self._loop.close()
+                self._loop = None
+                self._loop_thread = None
+
+TAG_RE = re.compile(r'#\w+')
+WHITESPACE_RE = re.compile(r'\s+')
+
+POST_HEADER_MARKER = "Visibile a tutti su LinkedIn e altrove"
+FOOTER_LINES = {"Attiva per visualizzare un’immagine più grande,", "Il documento è stato caricato"}
 
 def clean_scraped_post_data(post_data: dict) -> dict:
     """
@@ -612,66 +1009,42 @@ def clean_scraped_post_data(post_data: dict) -> dict:
     profiles and footers, and normalizes the newlines into spaces.
     Returns the updated post_data dictionary.
     """
-    import re
-    
-    original_title = post_data.get("title", "")
     original_body = post_data.get("body", "")
 
-    # Clean the body (remove header)
-    lines = original_body.split("\n")
-    start_index = 0
-    for i, line in enumerate(lines):
-        if "Visibile a tutti su LinkedIn e altrove" in line:
-            start_index = i + 1
-            break
-            
-    # Clean the body (remove footer)
-    end_index = len(lines)
-    for i in range(start_index, len(lines)):
-        line = lines[i].strip()
-        if line == "Attiva per visualizzare un’immagine più grande," or line == "Il documento è stato caricato" or " altre persone" in line:
-            end_index = i
+    # Clean the body (remove header): the post starts after the visibility line
+    pos = original_body.find(POST_HEADER_MARKER)
+    if pos != -1:
+        nl = original_body.find("\n", pos)
+        original_body = original_body[nl + 1:] if nl != -1 else ""
+
+    # One forward pass: stop at the footer, remember the last line with tags
+    body_lines = []
+    tag_line = -1
+    for line in original_body.split("\n"):
+        stripped = line.strip()
+        if stripped in FOOTER_LINES or " altre persone" in stripped:
             # Step back if the previous line is a number (e.g. "114" people liked)
-            if end_index > 0 and lines[end_index - 1].strip().isdigit():
-                end_index -= 1
+            if body_lines and body_lines[-1].strip().isdigit():
+                body_lines.pop()
             break
-            
-    # Also trim trailing empty lines before the footer
-    while end_index > start_index and not lines[end_index - 1].strip():
-        end_index -= 1
+        if "#" in line and TAG_RE.search(line):
+            tag_line = len(body_lines)
+        body_lines.append(line)
 
-    cleaned_body_lines = lines[start_index:end_index]
-    
-    # Extract Tags
+    # Extract Tags from the last line that has any
     tags = []
-    
-    # Walk backwards from the end of the cleaned body to find the line with tags
-    for i in range(len(cleaned_body_lines) - 1, -1, -1):
-        line = cleaned_body_lines[i]
-        
-        if "#" in line:
-            extracted_tags = re.findall(r'#\w+', line)
-            if extracted_tags:
-                for tag in extracted_tags:
-                    if tag not in tags:
-                        tags.append(tag)
-                        
-                for tag in extracted_tags:
-                    line = re.sub(rf'{tag}(?!\w)', '', line)
-                
-                cleaned_body_lines[i] = line.strip()
-                
-                if not cleaned_body_lines[i]:
-                    cleaned_body_lines.pop(i)
-                break
-            
-    # Replace any formatting \n (or stray \r) with spaces to form a single line of text
-    cleaned_body_lines = [l.replace('\r', '').replace('\n', ' ').strip() for l in cleaned_body_lines]
-            
-    # Re-join on space
-    cleaned_body_text = " ".join(l for l in cleaned_body_lines if l).strip()
-    # collapse multiple spaces into one space
-    cleaned_body_text = re.sub(r'\s+', ' ', cleaned_body_text).strip()
+    if tag_line != -1:
+        line = body_lines[tag_line]
+        seen = set()
+        for tag in TAG_RE.findall(line):
+            if tag not in seen:
+                seen.add(tag)
+                tags.append(tag)
+        # #\w+ is greedy, so each match already ends at a non-word char
+        body_lines[tag_line] = TAG_RE.sub('', line)
+
+    # Join on space (dropping stray \r) and collapse the whitespace in one go
+    cleaned_body_text = WHITESPACE_RE.sub(' ', " ".join(body_lines).replace('\r', '')).strip()
     
     # Extract new title (first sentence or up to 150 chars)
     new_title = ""
@@ -693,17 +1066,32 @@ def get_post_id_from_url(analytics_url: str, post_url: str, fallback_idx: int) -
     Extracts the URN ID from the analytics/post URL to use as file ID.
     If none is found, relies on a fallback with timestamp.
     """
-    import re
-    from datetime import datetime
-    
     url_to_parse = analytics_url if analytics_url else post_url
     
-    m = re.search(r"urn:li:activity:(\d{10,})", url_to_parse)
+    m = _ACTIVITY_URN_RE.search(url_to_parse)
     if m:
         return f"urn_li_activity_{m.group(1)}"
         
-    m2 = re.search(r"activity-(\d{10,})", url_to_parse)
+    m2 = _ACT_RE.search(url_to_parse)
     if m2:
         return f"urn_li_activity_{m2.group(1)}"
         
     return f"scraped_{datetime.now().strftime('%Y%m%d%H%M%S')}_{fallback_idx}"
+
+def upgrade_legacy_history(jsonl_path: str) -> None:
+    """
+    One-time conversion of an old history_<id>.json list into its .jsonl file
+    (one snapshot per line). An unreadable legacy file is left untouched.
+    """
+    jsonl_file = Path(jsonl_path)
+    legacy_file = jsonl_file.with_suffix(".json")
+    if jsonl_file.exists() or not legacy_file.exists():
+        return
+    try:
+        entries = json.loads(legacy_file.read_bytes())
+    except ValueError:
+        return
+    with open(jsonl_file, "w", encoding="utf-8") as f:
+        for entry in (entries if isinstance(entries, list) else [entries]):
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    legacy_file.unlink()
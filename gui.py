@@ -1,8 +1,8 @@
 import streamlit as st
 import os
+import re
 import json
 import uuid
-import pandas as pd
 from datetime import datetime, timedelta
 import sys
 
@@ -15,6 +15,169 @@ try:
 except ImportError:
     ContentGenerator = None
 
+try:
+    import orjson # type: ignore
+except ImportError:
+    orjson = None
+
+# ----------------- JSON I/O -----------------
+# orjson when installed (several times faster on these small records), stdlib json otherwise
+def dumps_json(data) -> str:
+    if orjson:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(data, indent=2, ensure_ascii=False)
+
+def append_jsonl(path: str, records):
+    """Append one compact JSON object per line, without rereading the file."""
+    if orjson:
+        with open(path, 'ab') as f:
+            f.write(b"".join(orjson.dumps(r) + b"\n" for r in records))
+    else:
+        with open(path, 'a', encoding='utf-8') as f:
+            f.writelines(json.dumps(r, ensure_ascii=False) + "\n" for r in records)
+
+def save_json(path: str, data):
+    if orjson:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+def load_json(path: str):
+    with open(path, 'rb') as f:
+        raw = f.read()
+    return orjson.loads(raw) if orjson else json.loads(raw)
+
+# ----------------- SHARED RESOURCES -----------------
+# Built once per process instead of on every click (Streamlit reruns the whole script)
+@st.cache_resource
+def get_generator(use_gemini: bool):
+    return ContentGenerator(use_gemini=use_gemini)
+
+@st.cache_resource
+def get_scraper(headless: bool):
+    # The browser stays open (and logged in) between scrapes
+    from core.scraper import LinkedInScraper
+    return LinkedInScraper(headless=headless)
+
+# ----------------- DRAFT FILE NAMES -----------------
+class _SafeTopicChars(dict):
+    """str.translate table keeping alphanumerics, spaces, '-' and '_' (filled lazily, so any Unicode letter works)."""
+    def __missing__(self, code):
+        c = chr(code)
+        self[code] = c if c.isalnum() or c in (' ', '-', '_') else None
+        return self[code]
+
+SAFE_TOPIC_CHARS = _SafeTopicChars()
+
+# ----------------- UPLOADED EXPORTS -----------------
+URL_COLUMN_KEYWORDS = ("url", "link", "post", "href")
+
+def find_url_column(columns):
+    """Position of the first column whose header looks like a URL column, or None."""
+    for i, col in enumerate(columns):
+        name = str(col).lower()
+        if any(kw in name for kw in URL_COLUMN_KEYWORDS):
+            return i
+    return None
+
+# ----------------- CACHED DATA LOADERS -----------------
+def _dir_signature(folder: str) -> tuple:
+    """(count, latest mtime) of the JSON files in folder: changes whenever one is written or removed."""
+    try:
+        entries = [e for e in os.scandir(folder) if e.name.endswith('.json')]
+    except FileNotFoundError:
+        return (0, 0.0)
+    return (len(entries), max((e.stat().st_mtime for e in entries), default=0.0))
+
+# The signature is part of the cache key, so the JSON files are re-read only
+# after something on disk changed, not on every widget interaction
+@st.cache_data(ttl=300)
+def _cached_metrics(sig: tuple) -> list:
+    return load_all_metrics()
+
+@st.cache_data(ttl=300)
+def _cached_posts(sig: tuple) -> list:
+    return load_all_posts()
+
+def cached_metrics() -> list:
+    return _cached_metrics(_dir_signature('data/metrics'))
+
+# Italian month abbreviations -> English, all replaced in a single regex pass
+IT_TO_EN_MONTHS = {"gen":"jan", "feb":"feb", "mar":"mar", "apr":"apr", "mag":"may", "giu":"jun", "lug":"jul", "ago":"aug", "set":"sep", "ott":"oct", "nov":"nov", "dic":"dec"}
+IT_MONTH_RE = re.compile(r'\b(' + '|'.join(IT_TO_EN_MONTHS) + r')\b')
+
+# Formats LinkedIn dates normally come in (after the month mapping), tried before the generic parser
+SCRAPED_DATE_FORMATS = ("%d %b %Y %H:%M", "%d %b %Y", "%Y-%m-%d %H:%M", "%Y-%m-%d")
+
+def parse_scraped_dates(dates: "pd.Series") -> "pd.Series":
+    """Safely parse a column of scraped dates, mapping Italian months if necessary (NaT when unparseable)."""
+    import pandas as pd
+    # Only real strings are parsed, any other cell becomes NaT
+    is_str = dates.map(lambda v: isinstance(v, str)).astype(bool)
+    clean = dates[is_str].astype(str).str.lower().str.replace(IT_MONTH_RE, lambda m: IT_TO_EN_MONTHS[m.group(1)], regex=True)
+    
+    # Fixed-format passes first (a tight C path); only what none of them matched
+    # goes through the slow per-row generic parser
+    parsed = []
+    for fmt in SCRAPED_DATE_FORMATS:
+        hit = pd.to_datetime(clean, format=fmt, errors='coerce')
+        parsed.append(hit[hit.notna()])
+        clean = clean[hit.isna()]
+        if clean.empty:
+            break
+    else:
+        parsed.append(pd.to_datetime(clean, dayfirst=True, format="mixed", errors='coerce'))
+    return pd.concat(parsed).reindex(dates.index)
+
+# Columns shown in the Analytics data editor (the rest stays server-side)
+EDITOR_COLUMNS = ['post_id', 'published_at', 'impressions', 'reactions', 'comments', 'shares', 'engagement_rate']
+
+@st.cache_data(ttl=300)
+def _metrics_frame(sig: tuple) -> "pd.DataFrame":
+    import pandas as pd
+    # Built and date-parsed once per data change; filters only slice it
+    df = pd.DataFrame(_cached_metrics(sig))
+    if 'published_at' in df.columns:
+        df['Date'] = parse_scraped_dates(df['published_at'])
+    return df
+
+def metrics_frame() -> "pd.DataFrame":
+    """Metrics as a DataFrame, with a parsed 'Date' column (NaT when unparseable)."""
+    return _metrics_frame(_dir_signature('data/metrics'))
+
+def cached_posts() -> list:
+    return _cached_posts(_dir_signature('data/posts'))
+
+def _file_mtime(path: str) -> float:
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return 0.0
+
+# The planner inputs: config.json, plus the metrics the Scheduler ranks windows with
+@st.cache_data(ttl=600)
+def _cached_config(config_mtime: float) -> dict:
+    return load_config()
+
+@st.cache_data(ttl=600)
+def _cached_windows(metrics_sig: tuple, config_mtime: float) -> list:
+    return get_optimal_windows()
+
+def cached_config() -> dict:
+    return _cached_config(_file_mtime('config.json'))
+
+def cached_windows() -> list:
+    return _cached_windows(_dir_signature('data/metrics'), _file_mtime('config.json'))
+
+def clear_data_caches():
+    """Drop the cached loaders after the scraper or the delete handler touched data/."""
+    _cached_metrics.clear()
+    _cached_posts.clear()
+    _metrics_frame.clear()
+    _cached_windows.clear()
+
 # Set up page configuration
 st.set_page_config(
     page_title="LinkedIn AI Agent",
@@ -54,7 +217,7 @@ if page == "✍️ Post Drafter":
     if submitted and topic:
         with st.spinner("Generating draft..."):
             if use_gemini and ContentGenerator:
-                generator = ContentGenerator(use_gemini=True)
+                generator = get_generator(True)
                 post_data = generator.generate_post(topic, format_type, enhance_with_ai=True)
             else:
                 post_data = generate_content(topic, format_type)
@@ -78,17 +241,11 @@ if page == "✍️ Post Drafter":
         # Save Button
         if st.button("💾 Save Draft to Workspace"):
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            # Collect safe characters manually with an explicit length limit
-            topic_str = str(topic)
-            safe_topic_chars = []
-            for c in topic_str:
-                if (c.isalnum() or c in (' ', '-', '_')) and len(safe_topic_chars) < 30:
-                    safe_topic_chars.append(c)
-            safe_topic = "".join(safe_topic_chars).rstrip()
+            # Keep only the safe characters (one C-level pass), then apply the length limit
+            safe_topic = str(topic).translate(SAFE_TOPIC_CHARS)[:30].rstrip()
             output_file = f"data/posts/draft_{safe_topic.replace(' ', '_')}_{timestamp}.json"
             
-            with open(output_file, 'w') as f:
-                json.dump(post, f, indent=2)
+            save_json(output_file, post)
             st.success(f"Draft saved successfully to `{output_file}`!")
 
 # ----------------- WEEKLY PLANNER -----------------
@@ -103,9 +260,9 @@ elif page == "📅 Weekly Planner":
     if st.button("🔄 Generate Weekly Plan"):
         with st.spinner("Analyzing past engagement to find optimal windows..."):
             week_of = start_date.strftime('%Y-%m-%d')
-            config = load_config()
+            config = cached_config()
             topics = config.get('topics', ['product', 'engineering', 'founder'])
-            windows = get_optimal_windows()
+            windows = cached_windows()
             
             # Generate plan structure
             plan_data = {
@@ -146,8 +303,7 @@ elif page == "📅 Weekly Planner":
             
         if st.button("💾 Save Weekly Plan"):
             output_file = f"data/schedules/plan_{plan['week_of']}.json"
-            with open(output_file, 'w') as f:
-                json.dump(plan, f, indent=2)
+            save_json(output_file, plan)
             st.success(f"Plan saved successfully to `{output_file}`!")
 
 # ----------------- ANALYTICS & METRICS -----------------
@@ -155,8 +311,8 @@ elif page == "📊 Analytics & Metrics":
     st.title("📊 Performance Analytics")
     st.write("View historical performance of your content.")
     
-    metrics = load_all_metrics()
-    posts = load_all_posts()
+    metrics = cached_metrics()
+    posts = cached_posts()
     
     if not metrics and not posts:
         st.warning("No data found! Use `python li.py init` to generate sample data, or `python li.py scrape` to get real data.")
@@ -170,28 +326,41 @@ elif page == "📊 Analytics & Metrics":
         col2.metric("Recorded Metrics", total_metrics)
         
         if metrics:
-            df = pd.DataFrame(metrics)
+            df = metrics_frame()
             
             # --- FEATURE 1: DATA FILTERING ---
             st.subheader("🔍 Filter Data")
-            col_f1, col_f2 = st.columns(2)
-            
-            min_impressions = 0
-            if 'impressions' in df.columns and not df.empty:
-                min_impressions = int(df['impressions'].min())
-                max_impressions = int(df['impressions'].max())
+            # Inside a form the widgets don't rerun the page on every change:
+            # the filters are applied together on "Apply"
+            with st.form("filters"):
+                col_f1, col_f2 = st.columns(2)
+                
+                min_impressions = 0
+                target_impressions = None
+                if 'impressions' in df.columns and not df.empty:
+                    min_impressions = int(df['impressions'].min())
+                    max_impressions = int(df['impressions'].max())
+                    
+                    # Protect slider against empty or single-value ranges
+                    if max_impressions > min_impressions:
+                        with col_f1:
+                            target_impressions = st.slider("Minimum Impressions", min_impressions, max_impressions, min_impressions)
                 
-                # Protect slider against empty or single-value ranges
-                if max_impressions > min_impressions:
-                    with col_f1:
-                        target_impressions = st.slider("Minimum Impressions", min_impressions, max_impressions, min_impressions)
-                        df = df[df['impressions'] >= target_impressions]
+                # Additional text filter (e.g., search by post_id or source)
+                with col_f2:
+                    search_query = st.text_input("Search (Post ID)", "")
+                    
+                st.form_submit_button("Apply")
             
-            # Additional text filter (e.g., search by post_id or source)
-            with col_f2:
-                search_query = st.text_input("Search (Post ID)", "")
-                if search_query:
-                    df = df[df['post_id'].str.contains(search_query, case=False, na=False)]
+            # Combine the filter masks and slice once
+            mask = None
+            if target_impressions is not None:
+                mask = df['impressions'] >= target_impressions
+            if search_query:
+                matches = df['post_id'].str.contains(search_query, case=False, na=False)
+                mask = matches if mask is None else mask & matches
+            if mask is not None:
+                df = df[mask]
                     
             if 'impressions' in df.columns:
                 col3.metric("Filtered Impressions", f"{df['impressions'].sum():,}")
@@ -200,12 +369,16 @@ elif page == "📊 Analytics & Metrics":
             st.subheader("Metrics Data (Select rows to delete)")
             
             # We use an interactive dataframe with a checkbox column to allow selection
-            df.insert(0, "Select", False)
+            # Only the displayed columns are serialized to the browser; df keeps
+            # everything else (e.g. the parsed dates for the chart)
+            # (selecting a column list already returns a new frame, no .copy() needed)
+            editor_df = df[[col for col in EDITOR_COLUMNS if col in df.columns]]
+            editor_df.insert(0, "Select", False)
             edited_df = st.data_editor(
-                df,
+                editor_df,
                 hide_index=True,
                 column_config={"Select": st.column_config.CheckboxColumn(required=True)},
-                disabled=[col for col in df.columns if col != "Select"],
+                disabled=[col for col in editor_df.columns if col != "Select"],
                 use_container_width=True,
                 key="metrics_editor"
             )
@@ -214,11 +387,25 @@ elif page == "📊 Analytics & Metrics":
             if not selected_rows.empty:
                 if st.button("🗑️ Delete Selected Records", type="primary"):
                     post_ids_to_delete = set(selected_rows["post_id"].tolist())
-                    deleted_count = 0
                     
-                    import os
                     base_dir = os.path.dirname(__file__) # type: ignore
-                    for folder, id_key in [('metrics', 'post_id'), ('posts', 'id')]:
+                    
+                    # Scraped records are stored one file per post: remove them by name
+                    legacy_ids = set()
+                    for pid in post_ids_to_delete:
+                        found = False
+                        for folder, name in [('metrics', f"metrics_{pid}.json"), ('posts', f"post_{pid}.json"),
+                                             ('history', f"history_{pid}.jsonl"), ('history', f"history_{pid}.json")]:
+                            try:
+                                os.remove(os.path.join(base_dir, 'data', folder, name))
+                                found = found or folder == 'metrics'
+                            except FileNotFoundError:
+                                pass
+                        if not found:
+                            legacy_ids.add(str(pid))
+                    
+                    # Legacy data (e.g. the sample lists from `li.py init`): scan the folders only for ids not found above
+                    for folder, id_key in ([('metrics', 'post_id'), ('posts', 'id')] if legacy_ids else []):
                         folder_path = os.path.join(base_dir, 'data', str(folder)) # type: ignore
                         if not os.path.exists(folder_path): continue # type: ignore
                             
@@ -227,55 +414,39 @@ elif page == "📊 Analytics & Metrics":
                             filepath = os.path.join(folder_path, str(filename)) # type: ignore
                             
                             try:
-                                with open(filepath, 'r', encoding='utf-8') as f:
-                                    data = json.load(f)
+                                data = load_json(filepath)
                                     
                                 if isinstance(data, list):
                                     original_len = len(data)
                                     # Handle both `id` and `post_id` since posts and metrics use different keys sometimes
-                                    new_data = [d for d in data if str(d.get(id_key, d.get('post_id'))) not in post_ids_to_delete]
+                                    new_data = [d for d in data if str(d.get(id_key, d.get('post_id'))) not in legacy_ids]
                                     if len(new_data) < original_len:
                                         if len(new_data) == 0:
                                             os.remove(filepath) # type: ignore
                                         else:
-                                            with open(filepath, 'w', encoding='utf-8') as f:
-                                                json.dump(new_data, f, indent=2, ensure_ascii=False)
+                                            save_json(filepath, new_data)
                                             
                                 elif isinstance(data, dict):
-                                    if str(data.get(id_key, data.get('post_id'))) in post_ids_to_delete:
+                                    if str(data.get(id_key, data.get('post_id'))) in legacy_ids:
                                         os.remove(filepath) # type: ignore
                             except Exception as e:
                                 pass # Ignore bad JSON files during rotation
                                 
+                    clear_data_caches()
                     st.success(f"Successfully deleted {len(post_ids_to_delete)} record(s)! Please refresh the page.")
                     st.stop()
             
             # Simple bar chart based on the FILTERED dataframe
-            if 'published_at' in edited_df.columns and 'impressions' in edited_df.columns and not edited_df.empty:
+            if 'Date' in df.columns and 'impressions' in edited_df.columns and not edited_df.empty:
                 st.subheader("Impressions Over Time")
-                # Safely parse dates, mapping Italian months if necessary
-                def parse_scraped_date(d_str):
-                    if not isinstance(d_str, str): return pd.NaT
-                    import re
-                    # Replace Italian abbreviations
-                    it_to_en = {"gen":"jan", "feb":"feb", "mar":"mar", "apr":"apr", "mag":"may", "giu":"jun", "lug":"jul", "ago":"aug", "set":"sep", "ott":"oct", "nov":"nov", "dic":"dec"}
-                    clean_str = d_str.lower()
-                    for it, en in it_to_en.items():
-                        clean_str = re.sub(r'\b' + it + r'\b', en, clean_str)
-                    try:
-                        from dateutil import parser
-                        return parser.parse(clean_str, dayfirst=True)
-                    except:
-                        return pd.NaT
-
-                temp_dates = edited_df['published_at'].apply(parse_scraped_date)
-                temp_dates = pd.to_datetime(temp_dates, errors='coerce') # Ensure it's a pandas datetime series
+                # Dates were parsed once in metrics_frame()
+                temp_dates = df.loc[edited_df.index, 'Date']
                 valid_mask = temp_dates.notna()
                 if valid_mask.any():
-                    df_chart = edited_df.loc[valid_mask].copy()
-                    df_chart['Date'] = temp_dates[valid_mask].dt.date
-                    impressions_by_date = df_chart.groupby('Date')['impressions'].sum().reset_index()
-                    st.bar_chart(impressions_by_date.set_index('Date'))
+                    # floor('D') keeps datetime64 keys, so the groupby hashes int64 instead of date objects
+                    days = temp_dates[valid_mask].dt.floor('D').rename('Date')
+                    impressions_by_date = edited_df.loc[valid_mask, 'impressions'].groupby(days, sort=True).sum()
+                    st.bar_chart(impressions_by_date.to_frame())
                 else:
                     st.info("No valid dates found in the filtered metrics data to display a timeline chart.")
         
@@ -287,6 +458,9 @@ elif page == "📊 Analytics & Metrics":
 
 # ----------------- CONTENT SCRAPER -----------------
 elif page == "🕸️ Content Scraper":
+    # pandas is only needed on the pages that use it (the Analytics helpers import it themselves)
+    import pandas as pd
+    
     st.title("🕸️ Live Content Scraper")
     st.write("Extract analytics and post content directly from live LinkedIn URLs.")
     
@@ -297,31 +471,34 @@ elif page == "🕸️ Content Scraper":
     if uploaded_file is not None:
         try:
             if uploaded_file.name.endswith('.csv'):
-                df_upload = pd.read_csv(uploaded_file)
+                def read_upload(**kwargs):
+                    uploaded_file.seek(0)
+                    return pd.read_csv(uploaded_file, **kwargs)
             else:
                 # LinkedIn exports usually have URLs in the 3rd sheet ('Contenuti principali'), starting on row 2
                 xls = pd.ExcelFile(uploaded_file)
-                if len(xls.sheet_names) >= 3:
-                    df_upload = pd.read_excel(xls, sheet_name=2, skiprows=1)
-                else:
-                    df_upload = pd.read_excel(xls) # fallback
+                sheet_args = {"sheet_name": 2, "skiprows": 1} if len(xls.sheet_names) >= 3 else {}
+                def read_upload(**kwargs):
+                    return pd.read_excel(xls, **sheet_args, **kwargs)
             
-            # Find the URL column robustly
+            # Find the URL column robustly from the header alone, then load only that column
             url_col = None
-            for col in df_upload.columns:
-                if any(kw in str(col).lower() for kw in ("url", "link", "post", "href")):
-                    url_col = col
-                    break
+            header = read_upload(nrows=0).columns
+            url_idx = find_url_column(header)
+            if url_idx is not None:
+                df_upload = read_upload(usecols=[url_idx])
+                url_col = df_upload.columns[0]
+            else:
+                df_upload = read_upload()
             
             # Fallback for LinkedIn's exact italian formatting: sometimes row 0 is headers
             if not url_col and not df_upload.empty:
                 # Try setting first row as header manually
                 df_upload.columns = df_upload.iloc[0]
                 df_upload = df_upload[1:]
-                for col in df_upload.columns:
-                    if any(kw in str(col).lower() for kw in ("url", "link", "post", "href")):
-                        url_col = col
-                        break
+                url_idx = find_url_column(df_upload.columns)
+                if url_idx is not None:
+                    url_col = df_upload.columns[url_idx]
                         
             if url_col:
                 # Handle cases where multiple columns might have the exact same name returning a DataFrame instead of a Series
@@ -329,8 +506,11 @@ elif page == "🕸️ Content Scraper":
                 if isinstance(target_col, pd.DataFrame):
                     target_col = target_col.iloc[:, 0]
                     
-                valid_urls = target_col.dropna().astype(str).str.strip().tolist()
-                valid_urls = [u for u in valid_urls if u.startswith("http")]
+                valid_urls = (
+                    target_col.dropna().astype(str).str.strip()
+                    .loc[lambda s: s.str.startswith("http")]
+                    .tolist()
+                )
                 if valid_urls:
                     extracted_urls = "\n".join(valid_urls)
                     st.success(f"✅ Automatically extracted {len(valid_urls)} URLs from the file!")
@@ -354,37 +534,61 @@ elif page == "🕸️ Content Scraper":
         else:
             with st.spinner(f"Scraping {len(urls)} URLs... Please wait (this could take a minute)."):
                 try:
-                    # FIX FOR WINDOWS: Playwright sync API under Streamlit throws NotImplementedError 
+                    # FIX FOR WINDOWS: Playwright under Streamlit throws NotImplementedError 
                     # in asyncio subprocess execution without the correct EventLoopPolicy.
                     if sys.platform == 'win32':
                         import asyncio
                         asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
                         
-                    from core.scraper import LinkedInScraper
-                    scraper = LinkedInScraper(headless=headless)
-                    records = scraper.scrape_urls(urls)
+                    from core.scraper import get_post_id_from_url, clean_scraped_post_data, upgrade_legacy_history, LOGIN_REQUIRED_ERROR
+                    scraper = get_scraper(headless)
+                    try:
+                        records = scraper.scrape_urls(urls)
+                    except Exception:
+                        # Don't keep a broken browser around: the next scrape relaunches it
+                        scraper.close()
+                        raise
+                    
+                    # Session missing or expired: drop the cached browser, so the
+                    # next scrape starts fresh and can offer the login again
+                    if any(r.get("error") == LOGIN_REQUIRED_ERROR for r in records or []):
+                        scraper.close()
+                        try:
+                            # Only this entry: the scraper cached for the other mode stays open
+                            get_scraper.clear(headless)
+                        except TypeError:
+                            # Streamlit < 1.34 can only clear everything: close both instances first
+                            for mode in (False, True):
+                                get_scraper(mode).close()
+                            get_scraper.clear()
                     
                     if not records:
                         st.error("⚠️ No data was extracted.")
                     else:
                         success_count = 0
                         
-                        def safe_int(val) -> int:
-                            if not val: return 0
-                            clean = str(val).replace(",", "").replace(".", "").strip()
-                            return int(clean) if clean.isdigit() else 0
+                        # Counters of all records cleaned in one vectorized pass:
+                        # thousands separators dropped, anything not purely digits -> 0
+                        raw_counts = pd.DataFrame([{k: r.get(k) for k in ("impressions", "reactions", "comments", "reposts")} for r in records])
+                        for col in raw_counts.columns:
+                            clean = raw_counts[col].astype(str).str.replace(",", "", regex=False).str.replace(".", "", regex=False).str.strip()
+                            raw_counts[col] = pd.to_numeric(clean.where(clean.str.isdigit()), errors='coerce').fillna(0).astype(int)
+                        counts = raw_counts.to_dict('records')
                             
-                        # Process records into standard JSON schemas
+                        # Process records into standard JSON schemas, collected in memory
+                        # and written once per file after the loop
+                        posts_out = {}
+                        metrics_out = {}
+                        history_updates = {}
                         for idx, record in enumerate(records):
                             if record.get("error"):
                                 st.error(f"Failed to scrape {record['post_url'][:50]}...: {record['error']}")
                                 continue
                                 
                             # Extract the true LinkedIn Activity URN from the analytics URL or post URL
-                            from core.scraper import get_post_id_from_url, clean_scraped_post_data
                             post_id = get_post_id_from_url(record.get("analytics_url", ""), record.get("post_url", ""), idx)
                             
-                            # 1. Save to data/posts
+                            # 1. Post for data/posts
                             post_text = record.get("post_text", "").strip()
                             pub_date = record.get("post_date", "")
                             pub_time = record.get("post_time", "")
@@ -401,18 +605,15 @@ elif page == "🕸️ Content Scraper":
                             }
                             
                             # Apply data cleaning
-                            post_data = clean_scraped_post_data(post_data)
-                            
-                            with open(f"data/posts/post_{post_id}.json", 'w', encoding='utf-8') as f:
-                                json.dump(post_data, f, indent=2, ensure_ascii=False)
+                            posts_out[post_id] = clean_scraped_post_data(post_data)
                     
-                            # 2. Save to data/metrics
+                            # 2. Metrics for data/metrics
                             metrics_data = {
                                 "post_id": post_id,
-                                "impressions": safe_int(record.get("impressions")),
-                                "reactions": safe_int(record.get("reactions")),
-                                "comments": safe_int(record.get("comments")),
-                                "shares": safe_int(record.get("reposts")),
+                                "impressions": counts[idx]["impressions"],
+                                "reactions": counts[idx]["reactions"],
+                                "comments": counts[idx]["comments"],
+                                "shares": counts[idx]["reposts"],
                                 "clicks": 0, 
                                 "extracted_at": datetime.now().isoformat(),
                                 "published_at": published_at
@@ -423,29 +624,30 @@ elif page == "🕸️ Content Scraper":
                                 eng_rate = (int(metrics_data["reactions"]) + int(metrics_data["comments"]) + int(metrics_data["shares"])) / float(metrics_data["impressions"])
                                 metrics_data["engagement_rate"] = float(round(eng_rate, 4)) # type: ignore
                                 
-                            with open(f"data/metrics/metrics_{post_id}.json", 'w', encoding='utf-8') as f:
-                                json.dump(metrics_data, f, indent=2, ensure_ascii=False)
+                            metrics_out[post_id] = metrics_data
                                 
-                            # 3. Save to data/history
-                            history_dir = "data/history"
-                            os.makedirs(history_dir, exist_ok=True)
-                            history_file = f"{history_dir}/history_{post_id}.json"
-                            
-                            history_data = []
-                            if os.path.exists(history_file):
-                                try:
-                                    with open(history_file, 'r', encoding='utf-8') as f:
-                                        history_data = json.load(f)
-                                except Exception:
-                                    history_data = []
-                                    
-                            history_data.append(metrics_data)
-                            with open(history_file, 'w', encoding='utf-8') as f:
-                                json.dump(history_data, f, indent=2, ensure_ascii=False)
+                            # 3. Snapshot for data/history (every scrape is kept)
+                            history_updates.setdefault(post_id, []).append(metrics_data)
                                 
                             success_count += 1
                             
+                        # Flush: the same post scraped twice is written once, with the latest data
+                        for post_id, post_data in posts_out.items():
+                            save_json(f"data/posts/post_{post_id}.json", post_data)
+                        for post_id, metrics_data in metrics_out.items():
+                            save_json(f"data/metrics/metrics_{post_id}.json", metrics_data)
+                            
+                        history_dir = "data/history"
+                        if history_updates:
+                            os.makedirs(history_dir, exist_ok=True)
+                        # History is append-only JSONL: one snapshot per line, never reread here
+                        for post_id, entries in history_updates.items():
+                            history_file = f"{history_dir}/history_{post_id}.jsonl"
+                            upgrade_legacy_history(history_file)
+                            append_jsonl(history_file, entries)
+                            
                         if success_count > 0:
+                            clear_data_caches()
                             st.success(f"✅ Successfully scraped and saved {success_count}/{len(urls)} posts and metrics to your workspace!")
                         else:
                             st.warning("⚠️ Scraper ran, but no valid data was extracted. Ensure the URLs are valid public or logged-in LinkedIn posts.")
@@ -462,9 +664,8 @@ elif page == "🕸️ Content Scraper":
     st.write("Scarica le statistiche e il contenuto di TUTTI i post in un unico file JSON, ottimizzato per essere utilizzato come knowledge base per un GEM personalizzato.")
     
     try:
-        from li import load_all_posts, load_all_metrics
-        kb_posts = load_all_posts()
-        kb_metrics = load_all_metrics()
+        kb_posts = cached_posts()
+        kb_metrics = cached_metrics()
         
         if kb_posts:
             # Index metrics by post_id to combine them easily
@@ -496,7 +697,7 @@ elif page == "🕸️ Content Scraper":
                 }
                 kb_data.append(kb_entry)
                 
-            kb_json_str = json.dumps(kb_data, indent=2, ensure_ascii=False)
+            kb_json_str = dumps_json(kb_data)
             
             st.download_button(
                 label="📦 Scarica JSON Knowledge Base",
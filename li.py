@@ -1362,8 +1362,8 @@ def scrape_linkedin_content(args: SimpleArgs):
 
     print(f"🚀 Initializing LinkedIn Scraper for {len(urls)} URLs...")
     headless = 'headless' in args.flags
-    scraper = LinkedInScraper(headless=headless)
-    records = scraper.scrape_urls(urls)
+    with LinkedInScraper(headless=headless) as scraper:
+        records = scraper.scrape_urls(urls)
 
     if not records:
         print("⚠️ No data was extracted.")
@@ -1384,7 +1384,7 @@ def scrape_linkedin_content(args: SimpleArgs):
             continue
             
         # Extract from URL using the helper
-        from core.scraper import get_post_id_from_url, clean_scraped_post_data
+        from core.scraper import get_post_id_from_url, clean_scraped_post_data, upgrade_legacy_history
         post_id = get_post_id_from_url(record.get("analytics_url", ""), record.get("post_url", ""), idx)
         
         # 1. Save to data/posts (text)
@@ -1435,19 +1435,12 @@ def scrape_linkedin_content(args: SimpleArgs):
         # 3. Save to data/history
         history_dir = os.path.join(os.path.dirname(__file__), 'data', 'history')
         os.makedirs(history_dir, exist_ok=True)
-        history_file = os.path.join(history_dir, f"history_{post_id}.json")
+        history_file = os.path.join(history_dir, f"history_{post_id}.jsonl")
+        upgrade_legacy_history(history_file)
         
-        history_data = []
-        if os.path.exists(history_file):
-            try:
-                with open(history_file, 'r', encoding='utf-8') as f:
-                    history_data = json.load(f)
-            except Exception:
-                history_data = []
-                
-        history_data.append(metrics_data)
-        with open(history_file, 'w', encoding='utf-8') as f:
-            json.dump(history_data, f, indent=2, ensure_ascii=False)
+        # Append-only JSONL: one snapshot per line, no read/rewrite of the whole history
+        with open(history_file, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(metrics_data, ensure_ascii=False) + "\n")
             
         success_count += 1
         